@@ -150,6 +150,33 @@ def memory_vector_top_k() -> int:
         return 50
 
 
+def memory_reranker_enabled() -> bool:
+    cfg = load_config()
+    return bool(_get(cfg, "memory", "reranker", "enabled", default=False))
+
+
+def memory_reranker_model_dir() -> str:
+    cfg = load_config()
+    v = _get(cfg, "memory", "reranker", "model_dir", default="./models/ms-marco-MiniLM-L-6-v2")
+    return str(v or "./models/ms-marco-MiniLM-L-6-v2")
+
+
+def memory_reranker_max_length() -> int:
+    cfg = load_config()
+    try:
+        return int(_get(cfg, "memory", "reranker", "max_length", default=256))
+    except Exception:
+        return 256
+
+
+def memory_reranker_candidate_pool() -> int:
+    cfg = load_config()
+    try:
+        return int(_get(cfg, "memory", "reranker", "candidate_pool", default=20))
+    except Exception:
+        return 20
+
+
 def supervisor_interval_s() -> float:
     cfg = load_config()
     try:
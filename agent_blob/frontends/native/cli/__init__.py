@@ -1,4 +1,3 @@
-from .main import main
-
-__all__ = ["main"]
+from .main import main, main_sync
 
+__all__ = ["main", "main_sync"]
@@ -6,7 +6,7 @@ import os
 import sys
 import uuid
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
 import websockets
 from dotenv import load_dotenv
@@ -15,6 +15,10 @@ from agent_blob.frontends.native.common.printer import Printer
 from agent_blob import config
 
 
+# Largest gateway frame the CLI accepts (websockets defaults to 1 MiB).
+WS_MAX_MESSAGE_BYTES = 8 * 1024 * 1024
+
+
 def _new_id(prefix: str) -> str:
     return f"{prefix}_{uuid.uuid4().hex[:12]}"
 
@@ -54,7 +58,9 @@ async def main() -> None:
     stdin_q: asyncio.Queue[str] = asyncio.Queue()
     asyncio.create_task(_stdin_lines(stdin_q))
 
-    async with websockets.connect(url) as ws:
+    # Token events are tiny frames: per-message deflate costs more CPU than it saves on loopback, and
+    # large tool results shouldn't trip the 1 MiB default frame limit.
+    async with websockets.connect(url, compression=None, max_size=WS_MAX_MESSAGE_BYTES) as ws:
         connect_id = _new_id("connect")
         await ws.send(
             json.dumps(
@@ -83,6 +89,36 @@ async def main() -> None:
             )
             print(f"\n[{run_id}] queued")
 
+        def on_status(run_id: str, buf: Optional[RunBuffer], payload: dict) -> None:
+            if buf:
+                buf.status = payload.get("status", buf.status)
+                printer.status(run_id, buf.status)
+
+        def on_error(run_id: str, buf: Optional[RunBuffer], payload: dict) -> None:
+            printer.error(run_id, payload.get("message", ""))
+            if buf:
+                buf.done = True
+
+        def on_final(run_id: str, buf: Optional[RunBuffer], payload: dict) -> None:
+            if buf:
+                buf.done = True
+                printer.done(run_id)
+
+        # run.* events dispatch straight to a handler (run.token arrives far more often than the rest).
+        run_handlers: Dict[str, Callable[[str, Optional[RunBuffer], dict], None]] = {
+            "run.token": lambda run_id, buf, p: printer.token(run_id, p.get("content", "")),
+            "run.status": on_status,
+            "run.log": lambda run_id, buf, p: printer.log(run_id, p.get("message", "")),
+            "run.error": on_error,
+            "run.final": on_final,
+            "run.tool_call": lambda run_id, buf, p: printer.log(
+                run_id, f"tool_call: {p.get('toolName','')} {p.get('arguments',{})}"
+            ),
+            "run.tool_result": lambda run_id, buf, p: printer.log(
+                run_id, f"tool_result: {p.get('toolName','')} {p.get('ok', True)}"
+            ),
+        }
+
         async def handle_event(msg: dict):
             event_type = msg.get("event")
             payload = msg.get("payload") or {}
@@ -98,39 +134,23 @@ async def main() -> None:
                 capability = payload.get("capability", "")
                 preview = payload.get("preview", "")
                 reason = payload.get("reason", "")
-                print(f"\n[{run_id}] permission required: {capability}")
+                lines = [f"\n[{run_id}] permission required: {capability}"]
                 if reason:
-                    print(f"  reason: {reason}")
+                    lines.append(f"  reason: {reason}")
                 if preview:
-                    print(f"  preview: {preview}")
-                print("Allow? [y/N]: ", end="", flush=True)
+                    lines.append(f"  preview: {preview}")
+                lines.append("Allow? [y/N]: ")
+                sys.stdout.write("\n".join(lines))
+                sys.stdout.flush()
                 return
 
-            if event_type in ("run.status", "run.log", "run.error", "run.final", "run.token", "run.tool_call", "run.tool_result"):
-                run_id = payload.get("runId", "")
-                if run_id and run_id not in runs:
-                    runs[run_id] = RunBuffer(run_id=run_id)
-                buf = runs.get(run_id)
-
-                if event_type == "run.status" and buf:
-                    buf.status = payload.get("status", buf.status)
-                    printer.status(run_id, buf.status)
-                elif event_type == "run.log":
-                    printer.log(run_id, payload.get("message", ""))
-                elif event_type == "run.error":
-                    printer.error(run_id, payload.get("message", ""))
-                    if buf:
-                        buf.done = True
-                elif event_type == "run.final":
-                    if buf:
-                        buf.done = True
-                        printer.done(run_id)
-                elif event_type == "run.token":
-                    printer.token(run_id, payload.get("content", ""))
-                elif event_type == "run.tool_call":
-                    printer.log(run_id, f"tool_call: {payload.get('toolName','')} {payload.get('arguments',{})}")
-                elif event_type == "run.tool_result":
-                    printer.log(run_id, f"tool_result: {payload.get('toolName','')} {payload.get('ok', True)}")
+            handler = run_handlers.get(event_type)
+            if handler is None:
+                return
+            run_id = payload.get("runId", "")
+            if run_id and run_id not in runs:
+                runs[run_id] = RunBuffer(run_id=run_id)
+            handler(run_id, runs.get(run_id), payload)
 
         async def handle_response(msg: dict):
             if msg.get("ok") is False:
@@ -184,3 +204,21 @@ async def main() -> None:
                     await send_run(line)
 
         await asyncio.gather(receiver(), sender())
+
+
+def main_sync() -> None:
+    """
+    Console-script entry point (`agent-blob`). Runs on uvloop when it is installed (uvicorn[standard]
+    brings it in); otherwise on the default asyncio loop.
+    """
+    try:
+        import uvloop  # type: ignore
+
+        loop_factory = uvloop.new_event_loop
+    except Exception:
+        loop_factory = None
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
+    except KeyboardInterrupt:
+        pass
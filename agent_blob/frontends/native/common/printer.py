@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
@@ -34,12 +35,14 @@ class Printer:
             return
         started = self.started_stream or set()
         if run_id not in started:
-            print(f"\n[{run_id}] ", end="", flush=True)
             started.add(run_id)
             self.started_stream = started
             self.active_stream_run_id = run_id
+            text = f"\n[{run_id}] {text}"
         elif self.active_stream_run_id != run_id:
-            print(f"\n[{run_id}] ", end="", flush=True)
             self.active_stream_run_id = run_id
-        print(text, end="", flush=True)
+            text = f"\n[{run_id}] {text}"
+        # Tokens arrive one small chunk at a time: emit the prefix and text as a single write + flush.
+        sys.stdout.write(text)
+        sys.stdout.flush()
 
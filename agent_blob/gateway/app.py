@@ -1,7 +1,6 @@
 import asyncio
 import logging
 import os
-import time
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, Dict
 from uuid import uuid4
@@ -47,6 +46,9 @@ class Gateway:
         self._supervisor_task = asyncio.create_task(self._supervisor_loop())
         self._adapter_tasks = await start_enabled_adapters(gateway=self)
 
+    async def shutdown(self):
+        await self.runtime.shutdown()
+
     def _next_seq(self) -> int:
         self._seq += 1
         return self._seq
@@ -121,18 +123,7 @@ class Gateway:
         maintenance_interval_s = config.maintenance_interval_s()
         while True:
             try:
-                tasks = await self.runtime.tasks.list_tasks()
-                now = time.time()
-                window_s = config.tasks_attach_window_s()
-                always_active = {"running", "waiting_permission", "waiting_user"}
-                active = []
-                for t in tasks:
-                    status = str(t.get("status") or "")
-                    if status in ("done", "cancelled", "failed"):
-                        continue
-                    updated = float(t.get("updated_at", 0) or 0)
-                    if status in always_active or (now - updated) <= window_s:
-                        active.append(t)
+                active = await self.runtime.tasks.list_active(window_s=config.tasks_attach_window_s())
                 active_count = len(active)
                 should_emit = debug_ticks or (last_active_count is None) or (active_count != last_active_count)
                 if should_emit:
@@ -329,6 +320,10 @@ def create_app() -> FastAPI:
     async def _startup():
         await gateway.startup()
 
+    @app.on_event("shutdown")
+    async def _shutdown():
+        await gateway.shutdown()
+
     @app.get("/health")
     async def health():
         return {"ok": True, "version": "2.0.0"}
@@ -398,3 +393,12 @@ def create_app() -> FastAPI:
 
 def _is_req(v: Any) -> bool:
     return isinstance(v, dict) and v.get("type") == "req" and isinstance(v.get("id"), str) and isinstance(v.get("method"), str)
+
+
+def run() -> None:
+    """
+    Console-script entry point (`agent-blob-gateway`): serve the gateway on the configured host/port.
+    """
+    import uvicorn
+
+    uvicorn.run(create_app(), host=config.gateway_host(), port=config.gateway_port())
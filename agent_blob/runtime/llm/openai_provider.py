@@ -20,9 +20,26 @@ class OpenAIChatCompletionsProvider:
             raise RuntimeError("OPENAI_API_KEY is not set")
 
         # Import lazily so non-LLM paths (tests, tools-only) don't require openai installed.
-        from openai import AsyncOpenAI  # type: ignore
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient  # type: ignore
 
-        self._client = AsyncOpenAI(api_key=self.api_key)
+        try:
+            import h2  # type: ignore  # noqa: F401
+
+            http2 = True
+        except Exception:
+            http2 = False
+
+        # One long-lived, pooled client shared by chat streaming, memory extraction and embeddings;
+        # with h2 installed, concurrent requests multiplex over a single connection.
+        self._http = DefaultAsyncHttpxClient(
+            http2=http2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+        self._client = AsyncOpenAI(api_key=self.api_key, http_client=self._http)
+
+    async def aclose(self) -> None:
+        await self._client.close()
 
     async def stream_chat(self, *, model: str, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
         stream = await self._client.chat.completions.create(
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
@@ -64,24 +65,11 @@ class MCPClientManager:
         # Keep server config fresh even if agent_blob.json changes while running.
         self.reload()
 
-        out: List[Dict[str, Any]] = []
-        for s in self._servers:
-            if s.transport != "streamable-http":
-                continue
-            client = MCPStreamableHttpClient(base_url=s.url)
-            try:
-                tools = await client.tools_list()
-                for t in tools:
-                    out.append(
-                        {
-                            "server": s.name,
-                            "name": t.name,
-                            "description": t.description,
-                            "inputSchema": t.input_schema,
-                        }
-                    )
-            finally:
-                await client.close()
+        # Query servers concurrently; results keep the configured server order.
+        per_server = await asyncio.gather(
+            *(self._server_tools(s) for s in self._servers if s.transport == "streamable-http")
+        )
+        out: List[Dict[str, Any]] = [t for tools in per_server for t in tools]
         # Cache per-server
         by_server: Dict[str, List[Dict[str, Any]]] = {}
         for t in out:
@@ -90,6 +78,22 @@ class MCPClientManager:
             self._tools_cache[k] = v
         return out
 
+    async def _server_tools(self, s: MCPServerConfig) -> List[Dict[str, Any]]:
+        client = MCPStreamableHttpClient(base_url=s.url)
+        try:
+            tools = await client.tools_list()
+        finally:
+            await client.close()
+        return [
+            {
+                "server": s.name,
+                "name": t.name,
+                "description": t.description,
+                "inputSchema": t.input_schema,
+            }
+            for t in tools
+        ]
+
     async def call_tool(self, *, server: str, name: str, arguments: Dict[str, Any]) -> Any:
         # Keep server config fresh even if agent_blob.json changes while running.
         self.reload()
@@ -117,22 +121,21 @@ class MCPClientManager:
           {server, name, description, arguments?}
         """
         self.reload()
-        out: List[Dict[str, Any]] = []
-        for s in self._servers:
-            if s.transport != "streamable-http":
-                continue
-            client = MCPStreamableHttpClient(base_url=s.url)
-            try:
-                result = await client.prompts_list()
-                prompts = result.get("prompts") if isinstance(result, dict) else None
-                if isinstance(prompts, list):
-                    for p in prompts:
-                        if not isinstance(p, dict):
-                            continue
-                        out.append({"server": s.name, **p})
-            finally:
-                await client.close()
-        return out
+        per_server = await asyncio.gather(
+            *(self._server_prompts(s) for s in self._servers if s.transport == "streamable-http")
+        )
+        return [p for prompts in per_server for p in prompts]
+
+    async def _server_prompts(self, s: MCPServerConfig) -> List[Dict[str, Any]]:
+        client = MCPStreamableHttpClient(base_url=s.url)
+        try:
+            result = await client.prompts_list()
+        finally:
+            await client.close()
+        prompts = result.get("prompts") if isinstance(result, dict) else None
+        if not isinstance(prompts, list):
+            return []
+        return [{"server": s.name, **p} for p in prompts if isinstance(p, dict)]
 
     async def get_prompt(self, *, server: str, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
         self.reload()
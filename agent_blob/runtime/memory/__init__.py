@@ -1,3 +1,4 @@
 from .service import MemoryService
+from .reranker import MemoryReranker
 
-__all__ = ["MemoryService"]
+__all__ = ["MemoryService", "MemoryReranker"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+from agent_blob import config
+
+
+logger = logging.getLogger("agent_blob.memory")
+
+class MemoryReranker:
+    """
+    Optional cross-encoder reranking stage for long-term memory retrieval.
+
+    Rescores hybrid (BM25 + vector) candidates with an ONNX-exported ms-marco-MiniLM
+    cross-encoder. Disabled unless memory.reranker.enabled is set; if onnxruntime,
+    tokenizers, or the model files are unavailable, candidates pass through unchanged.
+    """
+
+    def __init__(self):
+        self.enabled = config.memory_reranker_enabled()
+        self.model_dir = Path(config.memory_reranker_model_dir())
+        self.max_length = max(16, config.memory_reranker_max_length())
+        self._session: Any = None
+        self._tokenizer: Any = None
+        self._input_names: List[str] = []
+        self._load_failed = False
+
+    @property
+    def ready(self) -> bool:
+        """
+        True once the model is loaded. Never triggers a load.
+        """
+        return self._session is not None
+
+    def load(self) -> bool:
+        """
+        Load the model if enabled (blocking; call off the event loop). Returns whether reranking is usable.
+        """
+        return self._load()
+
+    def _load(self) -> bool:
+        if self._session is not None:
+            return True
+        if not self.enabled or self._load_failed:
+            return False
+        try:
+            # Import lazily so the default (disabled) path doesn't require onnxruntime/tokenizers.
+            import onnxruntime as ort  # type: ignore
+            from tokenizers import Tokenizer  # type: ignore
+
+            tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+            tokenizer.enable_truncation(max_length=self.max_length)
+            tokenizer.enable_padding()
+            session = ort.InferenceSession(str(self.model_dir / "model.onnx"), providers=["CPUExecutionProvider"])
+        except Exception:
+            self._load_failed = True
+            # Reported once: later calls short-circuit on _load_failed and search falls back to plain hybrid.
+            logger.warning("memory reranker disabled: could not load model from %s", self.model_dir, exc_info=True)
+            return False
+        self._tokenizer = tokenizer
+        self._session = session
+        self._input_names = [i.name for i in session.get_inputs()]
+        return True
+
+    def rerank(self, *, query: str, candidates: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """
+        Reorder candidates by cross-encoder relevance and return the top `limit`.
+        All (query, content) pairs are scored in a single batched inference call.
+        """
+        limit = max(0, int(limit))
+        if not candidates or not self._load():
+            return candidates[:limit]
+        try:
+            import numpy as np  # type: ignore
+
+            encodings = self._tokenizer.encode_batch([(query, str(c.get("content", "") or "")) for c in candidates])
+            feed = {
+                "input_ids": np.asarray([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.asarray([e.attention_mask for e in encodings], dtype=np.int64),
+                "token_type_ids": np.asarray([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            logits = self._session.run(None, {k: v for k, v in feed.items() if k in self._input_names})[0]
+            scores = [float(x) for x in np.asarray(logits).reshape(len(candidates), -1)[:, 0]]
+        except Exception:
+            return candidates[:limit]
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        return [candidates[i] for i in order[:limit]]
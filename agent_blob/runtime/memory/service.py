@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
 from agent_blob import config
 from agent_blob.runtime.memory.extractor import MemoryExtractor
-from agent_blob.runtime.storage.memory_db import MemoryDB
+from agent_blob.runtime.memory.reranker import MemoryReranker
+from agent_blob.runtime.storage.memory_db import MemoryDB, cosine
 from agent_blob.runtime.storage.paths import memory_dir, data_dir
 from agent_blob.runtime.storage.jsonl_archive import rotate_jsonl, prune_archives
 
 
+# Cosine similarity above which a query reuses the previous query's reranking candidate pool.
+POOL_REUSE_SIMILARITY = 0.9
+
+
 class MemoryService:
     """
     Canonical V3 memory service:
@@ -29,6 +35,15 @@ class MemoryService:
         self._db_path = d / "agent_blob.sqlite"
         self._db = MemoryDB(self._db_path)
         self._extractor = MemoryExtractor()
+        self._reranker = MemoryReranker()
+        # Last reranked query: (query embedding, pool size, candidates). Follow-up questions tend to be close
+        # to the previous query, so its oversampled pool usually covers the new query's results too.
+        self._last_pool: Optional[Tuple[List[float], int, List[Dict[str, Any]]]] = None
+        # pinned.json is read on every turn; keep the parsed list (plus its normalized contents for
+        # duplicate checks) until the file's mtime changes, e.g. after a hand edit.
+        self._pinned: Optional[List[Dict[str, Any]]] = None
+        self._pinned_contents: set[str] = set()
+        self._pinned_mtime_ns: Optional[int] = None
 
     async def startup(self) -> None:
         self._migrate_legacy_files()
@@ -40,14 +55,32 @@ class MemoryService:
         self._db.startup()
 
     async def get_pinned(self) -> List[Dict[str, Any]]:
+        return list(self._pinned_items())
+
+    def _pinned_items(self) -> List[Dict[str, Any]]:
+        mtime = self._pinned_stat()
+        if self._pinned is None or mtime != self._pinned_mtime_ns:
+            try:
+                items = json.loads(self._pinned_path.read_text(encoding="utf-8"))
+            except Exception:
+                items = []
+            self._remember_pinned(items if isinstance(items, list) else [], mtime)
+        return self._pinned or []
+
+    def _pinned_stat(self) -> Optional[int]:
         try:
-            items = json.loads(self._pinned_path.read_text(encoding="utf-8"))
-        except Exception:
-            return []
-        return items if isinstance(items, list) else []
+            return self._pinned_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _remember_pinned(self, items: List[Dict[str, Any]], mtime: Optional[int]) -> None:
+        self._pinned = list(items)
+        self._pinned_contents = {str(x.get("content", "")).strip() for x in items if isinstance(x, dict)}
+        self._pinned_mtime_ns = mtime
 
     async def set_pinned(self, items: List[Dict[str, Any]]) -> None:
         self._pinned_path.write_text(json.dumps(items, indent=2, ensure_ascii=False), encoding="utf-8")
+        self._remember_pinned(items, self._pinned_stat())
         await self._append_audit(
             {
                 "action": "modified",
@@ -61,7 +94,7 @@ class MemoryService:
         if not content:
             return False
         existing = await self.get_pinned()
-        if any(isinstance(x, dict) and str(x.get("content", "")).strip() == content for x in existing):
+        if content in self._pinned_contents:
             return False
         existing.append(item)
         await self.set_pinned(existing)
@@ -85,24 +118,15 @@ class MemoryService:
             if not memories:
                 return {"structured_written": 0, "error": None}
             detail = self._db.upsert_many_detailed(run_id=run_id, memories=memories)
-            for item in detail.get("added", []):
-                await self._append_audit(
-                    {
-                        "action": "added",
-                        "entity": "memory",
-                        "run_id": run_id,
-                        "memory": item,
-                    }
-                )
-            for item in detail.get("modified", []):
-                await self._append_audit(
-                    {
-                        "action": "modified",
-                        "entity": "memory",
-                        "run_id": run_id,
-                        "memory": item,
-                    }
-                )
+            await self._append_audit_many(
+                [
+                    {"action": action, "entity": "memory", "run_id": run_id, "memory": item}
+                    for action in ("added", "modified")
+                    for item in detail.get(action, [])
+                ]
+            )
+            if detail.get("touched"):
+                self._last_pool = None
             return {"structured_written": int(detail.get("touched", 0)), "error": None}
         except Exception as exc:
             return {"structured_written": 0, "error": str(exc)}
@@ -119,15 +143,56 @@ class MemoryService:
                 query_embedding = None
         else:
             query_embedding = None
-        return self._db.search_hybrid(query=q, limit=int(limit), query_embedding=query_embedding)
+        if not await self._reranker_ready():
+            return self._db.search_hybrid(query=q, limit=int(limit), query_embedding=query_embedding)
+        # Over-fetch a bounded candidate pool from the hybrid index, rescore it with the
+        # cross-encoder, and keep the best `limit`. A near-duplicate of the previous query reuses its pool.
+        # The pool is memory.reranker.candidate_pool (default 20) rather than a multiple of `limit`: at the
+        # usual limit of 5, limit*1.5 leaves the cross-encoder almost nothing to reorder.
+        pool = max(1, int(limit), config.memory_reranker_candidate_pool())
+        last = self._last_pool
+        if (
+            query_embedding is not None
+            and last is not None
+            and last[1] >= pool
+            and cosine(query_embedding, last[0]) >= POOL_REUSE_SIMILARITY
+        ):
+            candidates = last[2]
+        else:
+            candidates = self._db.search_hybrid(
+                query=q,
+                limit=pool,
+                query_embedding=query_embedding,
+                candidate_limit=pool,
+            )
+            self._last_pool = (query_embedding, pool, candidates) if query_embedding is not None else None
+        return await asyncio.to_thread(self._reranker.rerank, query=q, candidates=candidates, limit=int(limit))
+
+    async def _reranker_ready(self) -> bool:
+        """
+        Whether the cross-encoder can be used. The first call loads the model off the event loop;
+        if that fails, search keeps using the plain hybrid path.
+        """
+        if not self._reranker.enabled:
+            return False
+        if self._reranker.ready:
+            return True
+        return await asyncio.to_thread(self._reranker.load)
 
     async def list_recent(self, *, limit: int = 20) -> List[Dict[str, Any]]:
         return self._db.list_recent(limit=int(limit))
 
+    async def list_recent_page(self, *, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        return self._db.list_recent_page(limit=int(limit))
+
+    async def count_added_since(self, *, since_ms: int) -> int:
+        return self._db.count_added_since(int(since_ms))
+
     async def delete(self, *, memory_id: str, run_id: str | None = None) -> Dict[str, Any]:
-        before = self._db.get_by_fingerprint(memory_id)
-        ok = self._db.delete_by_fingerprint(memory_id)
+        before = self._db.pop_by_fingerprint(memory_id)
+        ok = before is not None
         if ok:
+            self._last_pool = None
             await self._append_audit(
                 {
                     "action": "removed",
@@ -150,6 +215,7 @@ class MemoryService:
         if not vectors or len(vectors) != len(pending):
             return 0
         rows = [(int(pending[i]["rowid"]), vectors[i]) for i in range(len(pending))]
+        self._last_pool = None
         return self._db.write_embeddings(rows=rows, model=model)
 
     def _migrate_legacy_files(self) -> None:
@@ -205,9 +271,15 @@ class MemoryService:
         return {"rotated": bool(rec), "pruned": pruned}
 
     async def _append_audit(self, event: Dict[str, Any]) -> None:
-        rec = {
-            "ts_ms": int(time.time() * 1000),
-            **event,
-        }
+        await self._append_audit_many([event])
+
+    async def _append_audit_many(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Append several audit records with a single open + write.
+        """
+        if not events:
+            return
+        ts_ms = int(time.time() * 1000)
+        lines = [json.dumps({"ts_ms": ts_ms, **event}, ensure_ascii=False) + "\n" for event in events]
         with self._audit_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            f.write("".join(lines))
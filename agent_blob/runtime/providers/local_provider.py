@@ -10,7 +10,125 @@ from agent_blob.runtime.tools.shell import shell_run
 from agent_blob.runtime.tools.web import web_fetch
 from agent_blob.runtime.tools.search import fs_glob, fs_grep
 from agent_blob.runtime.tools.edit import edit_apply_patch
-from agent_blob.runtime.tools.registry import ToolDefinition
+from agent_blob.runtime.tools.registry import NO_ARGS_SCHEMA, ToolDefinition, object_schema
+
+
+# JSON-schema properties shared by the schedule_create_* tools.
+_SCHEDULE_PROMPT_PROPERTIES: Dict[str, Any] = {
+    "prompt": {"type": "string", "description": "What the agent should do when the schedule runs"},
+    "input": {"type": "string", "description": "(Deprecated) alias for prompt"},
+}
+_SCHEDULE_OPTION_PROPERTIES: Dict[str, Any] = {
+    "enabled": {"type": "boolean", "description": "Whether the schedule is active", "default": True},
+    "title": {"type": "string", "description": "Optional short title"},
+}
+
+
+# Tool argument schemas, built once at import and shared by every tools() call.
+_FILESYSTEM_READ_SCHEMA = object_schema({"path": {"type": "string", "description": "Path to file"}}, required=["path"])
+_FILESYSTEM_LIST_SCHEMA = object_schema(
+    {"path": {"type": "string", "description": "Path to directory"}},
+    required=["path"],
+)
+_FS_GLOB_SCHEMA = object_schema(
+    {
+        "pattern": {"type": "string", "description": "Glob pattern like **/*.py"},
+        "base_dir": {"type": "string", "description": "Base directory", "default": "."},
+        "limit": {"type": "integer", "description": "Max matches", "default": 200},
+    },
+    required=["pattern"],
+)
+_FS_GREP_SCHEMA = object_schema(
+    {
+        "query": {"type": "string", "description": "Substring query"},
+        "base_dir": {"type": "string", "description": "Base directory", "default": "."},
+        "limit": {"type": "integer", "description": "Max results", "default": 50},
+    },
+    required=["query"],
+)
+_EDIT_APPLY_PATCH_SCHEMA = object_schema(
+    {
+        "path": {"type": "string", "description": "Path to file"},
+        "patch": {"type": "string", "description": "Unified diff patch"},
+        "create_parents": {"type": "boolean", "description": "Create parent dirs", "default": True},
+    },
+    required=["path", "patch"],
+)
+_FILESYSTEM_WRITE_SCHEMA = object_schema(
+    {
+        "path": {"type": "string", "description": "Path to file"},
+        "content": {"type": "string", "description": "Full file content to write"},
+        "append": {"type": "boolean", "description": "Append instead of overwrite", "default": False},
+        "create_parents": {"type": "boolean", "description": "Create parent dirs", "default": True},
+    },
+    required=["path", "content"],
+)
+_SHELL_RUN_SCHEMA = object_schema(
+    {"command": {"type": "string", "description": "Shell command to run"}},
+    required=["command"],
+)
+_WEB_FETCH_SCHEMA = object_schema(
+    {
+        "url": {"type": "string", "description": "http(s) URL"},
+        "max_bytes": {"type": "integer", "description": "Max bytes to read", "default": 1000000},
+        "timeout_s": {"type": "number", "description": "Request timeout seconds", "default": 15},
+    },
+    required=["url"],
+)
+_SCHEDULE_CREATE_INTERVAL_SCHEMA = object_schema(
+    {
+        **_SCHEDULE_PROMPT_PROPERTIES,
+        "interval_s": {"type": "integer", "description": "Interval in seconds", "default": 3600},
+        **_SCHEDULE_OPTION_PROPERTIES,
+    },
+    required=["interval_s"],
+)
+_SCHEDULE_CREATE_DAILY_SCHEMA = object_schema(
+    {
+        **_SCHEDULE_PROMPT_PROPERTIES,
+        "hour": {"type": "integer", "description": "Hour (0-23)"},
+        "minute": {"type": "integer", "description": "Minute (0-59)"},
+        "tz": {"type": "string", "description": "IANA timezone, e.g. America/Los_Angeles (optional)"},
+        **_SCHEDULE_OPTION_PROPERTIES,
+    },
+    required=["hour", "minute"],
+)
+_SCHEDULE_CREATE_CRON_SCHEMA = object_schema(
+    {
+        **_SCHEDULE_PROMPT_PROPERTIES,
+        "cron": {"type": "string", "description": "Cron expression: min hour dom mon dow"},
+        "tz": {"type": "string", "description": "IANA timezone, e.g. America/New_York (optional)"},
+        **_SCHEDULE_OPTION_PROPERTIES,
+    },
+    required=["cron"],
+)
+_SCHEDULE_DELETE_SCHEMA = object_schema({"id": {"type": "string", "description": "Schedule id"}}, required=["id"])
+_SCHEDULE_UPDATE_SCHEMA = object_schema(
+    {
+        "id": {"type": "string", "description": "Schedule id"},
+        "enabled": {"type": "boolean", "description": "Whether the schedule is enabled"},
+    },
+    required=["id", "enabled"],
+)
+_MEMORY_SEARCH_SCHEMA = object_schema(
+    {
+        "query": {"type": "string", "description": "Search query"},
+        "limit": {"type": "integer", "description": "Max results", "default": 5},
+    },
+    required=["query"],
+)
+_MEMORY_LIST_RECENT_SCHEMA = object_schema({"limit": {"type": "integer", "description": "Max results", "default": 20}})
+_MEMORY_DELETE_SCHEMA = object_schema(
+    {"id": {"type": "string", "description": "Memory id from memory_search/list"}},
+    required=["id"],
+)
+
+
+def _schedule_prompt(args: Dict[str, Any]) -> str:
+    prompt = args.get("prompt")
+    if prompt is None:
+        prompt = args.get("input", "")
+    return str(prompt or "")
 
 
 class LocalProvider:
@@ -72,13 +190,11 @@ class LocalProvider:
 
         async def _schedule_create_interval(args: Dict[str, Any]) -> Any:
             await self.schedules.startup()
-            prompt = args.get("prompt")
-            if prompt is None:
-                prompt = args.get("input", "")
-            if not str(prompt or "").strip():
+            prompt = _schedule_prompt(args)
+            if not prompt.strip():
                 return {"ok": False, "error": "Missing prompt (what should the agent do when the schedule runs?)"}
             rec = await self.schedules.create_interval(
-                input=str(prompt or ""),
+                input=prompt,
                 interval_s=int(args.get("interval_s", 60) or 60),
                 enabled=bool(args.get("enabled", True)),
                 title=str(args.get("title", "") or "") or None,
@@ -87,13 +203,11 @@ class LocalProvider:
 
         async def _schedule_create_daily(args: Dict[str, Any]) -> Any:
             await self.schedules.startup()
-            prompt = args.get("prompt")
-            if prompt is None:
-                prompt = args.get("input", "")
-            if not str(prompt or "").strip():
+            prompt = _schedule_prompt(args)
+            if not prompt.strip():
                 return {"ok": False, "error": "Missing prompt (what should the agent do when the schedule runs?)"}
             rec = await self.schedules.create_daily(
-                input=str(prompt or ""),
+                input=prompt,
                 hour=int(args.get("hour", 7) or 7),
                 minute=int(args.get("minute", 30) or 30),
                 tz=(str(args.get("tz")).strip() if args.get("tz") is not None else None),
@@ -104,13 +218,11 @@ class LocalProvider:
 
         async def _schedule_create_cron(args: Dict[str, Any]) -> Any:
             await self.schedules.startup()
-            prompt = args.get("prompt")
-            if prompt is None:
-                prompt = args.get("input", "")
-            if not str(prompt or "").strip():
+            prompt = _schedule_prompt(args)
+            if not prompt.strip():
                 return {"ok": False, "error": "Missing prompt (what should the agent do when the schedule runs?)"}
             rec = await self.schedules.create_cron(
-                input=str(prompt or ""),
+                input=prompt,
                 cron=str(args.get("cron", "") or ""),
                 tz=(str(args.get("tz")).strip() if args.get("tz") is not None else None),
                 enabled=bool(args.get("enabled", True)),
@@ -136,230 +248,127 @@ class LocalProvider:
                 name="filesystem_read",
                 capability="filesystem.read",
                 description="Read a text file within the allowed root.",
-                parameters={
-                    "type": "object",
-                    "properties": {"path": {"type": "string", "description": "Path to file"}},
-                    "required": ["path"],
-                },
+                parameters=_FILESYSTEM_READ_SCHEMA,
                 executor=_fs_read,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="filesystem_list",
                 capability="filesystem.list",
                 description="List a directory within the allowed root.",
-                parameters={
-                    "type": "object",
-                    "properties": {"path": {"type": "string", "description": "Path to directory"}},
-                    "required": ["path"],
-                },
+                parameters=_FILESYSTEM_LIST_SCHEMA,
                 executor=_fs_list,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="fs_glob",
                 capability="filesystem.glob",
                 description="Find files by glob pattern under the allowed root (safe).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "pattern": {"type": "string", "description": "Glob pattern like **/*.py"},
-                        "base_dir": {"type": "string", "description": "Base directory", "default": "."},
-                        "limit": {"type": "integer", "description": "Max matches", "default": 200},
-                    },
-                    "required": ["pattern"],
-                },
+                parameters=_FS_GLOB_SCHEMA,
                 executor=_fs_glob,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="fs_grep",
                 capability="filesystem.grep",
                 description="Search for text under the allowed root (safe).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "description": "Substring query"},
-                        "base_dir": {"type": "string", "description": "Base directory", "default": "."},
-                        "limit": {"type": "integer", "description": "Max results", "default": 50},
-                    },
-                    "required": ["query"],
-                },
+                parameters=_FS_GREP_SCHEMA,
                 executor=_fs_grep,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="edit_apply_patch",
                 capability="filesystem.write",
                 description="Preferred for modifying existing files: apply a unified diff patch (requires permission).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "path": {"type": "string", "description": "Path to file"},
-                        "patch": {"type": "string", "description": "Unified diff patch"},
-                        "create_parents": {"type": "boolean", "description": "Create parent dirs", "default": True},
-                    },
-                    "required": ["path", "patch"],
-                },
+                parameters=_EDIT_APPLY_PATCH_SCHEMA,
                 executor=_edit_apply_patch,
             ),
             ToolDefinition(
                 name="filesystem_write",
                 capability="filesystem.write",
                 description="Write/overwrite a full text file (requires permission). Prefer edit_apply_patch for edits to existing files.",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "path": {"type": "string", "description": "Path to file"},
-                        "content": {"type": "string", "description": "Full file content to write"},
-                        "append": {"type": "boolean", "description": "Append instead of overwrite", "default": False},
-                        "create_parents": {"type": "boolean", "description": "Create parent dirs", "default": True},
-                    },
-                    "required": ["path", "content"],
-                },
+                parameters=_FILESYSTEM_WRITE_SCHEMA,
                 executor=_fs_write,
             ),
             ToolDefinition(
                 name="shell_run",
                 capability="shell.run",
                 description="Run a shell command (requires permission).",
-                parameters={
-                    "type": "object",
-                    "properties": {"command": {"type": "string", "description": "Shell command to run"}},
-                    "required": ["command"],
-                },
+                parameters=_SHELL_RUN_SCHEMA,
                 executor=_shell_run,
             ),
             ToolDefinition(
                 name="web_fetch",
                 capability="web.fetch",
                 description="Fetch a URL (GET) and return text content (requires permission).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "url": {"type": "string", "description": "http(s) URL"},
-                        "max_bytes": {"type": "integer", "description": "Max bytes to read", "default": 1000000},
-                        "timeout_s": {"type": "number", "description": "Request timeout seconds", "default": 15},
-                    },
-                    "required": ["url"],
-                },
+                parameters=_WEB_FETCH_SCHEMA,
                 executor=_web_fetch,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="schedule_list",
                 capability="schedules.list",
                 description="List schedules (interval-based) that can trigger background runs.",
-                parameters={"type": "object", "properties": {}},
+                parameters=NO_ARGS_SCHEMA,
                 executor=_schedule_list,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="schedule_create_interval",
                 capability="schedules.write",
                 description="Create an interval schedule that triggers a run every N seconds.",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {"type": "string", "description": "What the agent should do when the schedule runs"},
-                        "input": {"type": "string", "description": "(Deprecated) alias for prompt"},
-                        "interval_s": {"type": "integer", "description": "Interval in seconds", "default": 3600},
-                        "enabled": {"type": "boolean", "description": "Whether the schedule is active", "default": True},
-                        "title": {"type": "string", "description": "Optional short title"},
-                    },
-                    "required": ["interval_s"],
-                },
+                parameters=_SCHEDULE_CREATE_INTERVAL_SCHEMA,
                 executor=_schedule_create_interval,
             ),
             ToolDefinition(
                 name="schedule_create_daily",
                 capability="schedules.write",
                 description="Create a daily schedule at a specific local time (hour/minute).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {"type": "string", "description": "What the agent should do when the schedule runs"},
-                        "input": {"type": "string", "description": "(Deprecated) alias for prompt"},
-                        "hour": {"type": "integer", "description": "Hour (0-23)"},
-                        "minute": {"type": "integer", "description": "Minute (0-59)"},
-                        "tz": {"type": "string", "description": "IANA timezone, e.g. America/Los_Angeles (optional)"},
-                        "enabled": {"type": "boolean", "description": "Whether the schedule is active", "default": True},
-                        "title": {"type": "string", "description": "Optional short title"},
-                    },
-                    "required": ["hour", "minute"],
-                },
+                parameters=_SCHEDULE_CREATE_DAILY_SCHEMA,
                 executor=_schedule_create_daily,
             ),
             ToolDefinition(
                 name="schedule_create_cron",
                 capability="schedules.write",
                 description="Create a cron schedule (5-field: min hour dom mon dow).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {"type": "string", "description": "What the agent should do when the schedule runs"},
-                        "input": {"type": "string", "description": "(Deprecated) alias for prompt"},
-                        "cron": {"type": "string", "description": "Cron expression: min hour dom mon dow"},
-                        "tz": {"type": "string", "description": "IANA timezone, e.g. America/New_York (optional)"},
-                        "enabled": {"type": "boolean", "description": "Whether the schedule is active", "default": True},
-                        "title": {"type": "string", "description": "Optional short title"},
-                    },
-                    "required": ["cron"],
-                },
+                parameters=_SCHEDULE_CREATE_CRON_SCHEMA,
                 executor=_schedule_create_cron,
             ),
             ToolDefinition(
                 name="schedule_delete",
                 capability="schedules.write",
                 description="Delete a schedule by id.",
-                parameters={
-                    "type": "object",
-                    "properties": {"id": {"type": "string", "description": "Schedule id"}},
-                    "required": ["id"],
-                },
+                parameters=_SCHEDULE_DELETE_SCHEMA,
                 executor=_schedule_delete,
             ),
             ToolDefinition(
                 name="schedule_update",
                 capability="schedules.write",
                 description="Update a schedule (enable/disable).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "string", "description": "Schedule id"},
-                        "enabled": {"type": "boolean", "description": "Whether the schedule is enabled"},
-                    },
-                    "required": ["id", "enabled"],
-                },
+                parameters=_SCHEDULE_UPDATE_SCHEMA,
                 executor=_schedule_set_enabled,
             ),
             ToolDefinition(
                 name="memory_search",
                 capability="memory.search",
                 description="Search structured long-term memory items (returns ids you can use to delete).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "description": "Search query"},
-                        "limit": {"type": "integer", "description": "Max results", "default": 5},
-                    },
-                    "required": ["query"],
-                },
+                parameters=_MEMORY_SEARCH_SCHEMA,
                 executor=memory_search,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="memory_list_recent",
                 capability="memory.list",
                 description="List recent structured long-term memory items.",
-                parameters={
-                    "type": "object",
-                    "properties": {"limit": {"type": "integer", "description": "Max results", "default": 20}},
-                },
+                parameters=_MEMORY_LIST_RECENT_SCHEMA,
                 executor=memory_list_recent,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="memory_delete",
                 capability="memory.delete",
                 description="Delete one structured long-term memory item by id (requires permission).",
-                parameters={
-                    "type": "object",
-                    "properties": {"id": {"type": "string", "description": "Memory id from memory_search/list"}},
-                    "required": ["id"],
-                },
+                parameters=_MEMORY_DELETE_SCHEMA,
                 executor=memory_delete,
             ),
         ]
@@ -5,7 +5,25 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from agent_blob.runtime.capabilities.provider import CapabilityProvider
 from agent_blob.runtime.mcp import MCPClientManager
-from agent_blob.runtime.tools.registry import ToolDefinition
+from agent_blob.runtime.tools.registry import NO_ARGS_SCHEMA, ToolDefinition, object_schema
+
+
+_GET_PROMPT_SCHEMA = object_schema(
+    {
+        "server": {"type": "string", "description": "MCP server name"},
+        "name": {"type": "string", "description": "Prompt name"},
+        "arguments": {"type": "object", "description": "Optional prompt arguments"},
+    },
+    required=["server", "name"],
+)
+_CALL_SCHEMA = object_schema(
+    {
+        "server": {"type": "string", "description": "MCP server name"},
+        "name": {"type": "string", "description": "Tool name"},
+        "arguments": {"type": "object", "description": "Tool arguments (must be provided; use mcp_list_tools to see required fields)"},
+    },
+    required=["server", "name", "arguments"],
+)
 
 
 def _safe_name(s: str) -> str:
@@ -29,7 +47,7 @@ class MCPProvider:
     def tools(self) -> List[ToolDefinition]:
         # We can't do async discovery at construction time. Provide a lightweight "mcp_refresh" tool,
         # and expose MCP tools lazily at call-time via a generic dispatcher tool.
-        async def _mcp_list_servers(args: Dict[str, Any]) -> Any:
+        def _mcp_list_servers(args: Dict[str, Any]) -> Any:
             return {"ok": True, "servers": self.mgr.list_servers()}
 
         async def _mcp_refresh(args: Dict[str, Any]) -> Any:
@@ -66,58 +84,45 @@ class MCPProvider:
                 name="mcp_list_servers",
                 capability="mcp.list",
                 description="List configured MCP servers (from agent_blob.json).",
-                parameters={"type": "object", "properties": {}},
+                parameters=NO_ARGS_SCHEMA,
                 executor=_mcp_list_servers,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="mcp_list_tools",
                 capability="mcp.list",
                 description="List tools from configured MCP servers.",
-                parameters={"type": "object", "properties": {}},
+                parameters=NO_ARGS_SCHEMA,
                 executor=_mcp_list,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="mcp_refresh",
                 capability="mcp.refresh",
                 description="Refresh MCP tool list from configured servers.",
-                parameters={"type": "object", "properties": {}},
+                parameters=NO_ARGS_SCHEMA,
                 executor=_mcp_refresh,
             ),
             ToolDefinition(
                 name="mcp_list_prompts",
                 capability="mcp.list",
                 description="List prompts from configured MCP servers.",
-                parameters={"type": "object", "properties": {}},
+                parameters=NO_ARGS_SCHEMA,
                 executor=_mcp_prompts_list,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="mcp_get_prompt",
                 capability="mcp.call",
                 description="Get an MCP prompt by name (may require arguments depending on the server).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "server": {"type": "string", "description": "MCP server name"},
-                        "name": {"type": "string", "description": "Prompt name"},
-                        "arguments": {"type": "object", "description": "Optional prompt arguments"},
-                    },
-                    "required": ["server", "name"],
-                },
+                parameters=_GET_PROMPT_SCHEMA,
                 executor=_mcp_prompts_get,
             ),
             ToolDefinition(
                 name="mcp_call",
                 capability="mcp.call",
                 description="Call a tool on a configured MCP server (generic).",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "server": {"type": "string", "description": "MCP server name"},
-                        "name": {"type": "string", "description": "Tool name"},
-                        "arguments": {"type": "object", "description": "Tool arguments (must be provided; use mcp_list_tools to see required fields)"},
-                    },
-                    "required": ["server", "name", "arguments"],
-                },
+                parameters=_CALL_SCHEMA,
                 executor=_mcp_call,
             ),
         ]
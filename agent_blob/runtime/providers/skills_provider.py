@@ -4,10 +4,13 @@ from typing import Any, Dict, List, Optional
 
 from agent_blob.runtime.capabilities.provider import CapabilityProvider
 from agent_blob.runtime.skills.loader import SkillsLoader
-from agent_blob.runtime.tools.registry import ToolDefinition
+from agent_blob.runtime.tools.registry import NO_ARGS_SCHEMA, ToolDefinition, object_schema
 from agent_blob.runtime.tools.skills import build_skills_tools
 
 
+_GET_SCHEMA = object_schema({"name": {"type": "string", "description": "Skill name"}}, required=["name"])
+
+
 class SkillsProvider:
     name = "skills"
 
@@ -21,19 +24,17 @@ class SkillsProvider:
                 name="skills_list",
                 capability="skills.list",
                 description="List available local skills (SKILL.md).",
-                parameters={"type": "object", "properties": {}},
+                parameters=NO_ARGS_SCHEMA,
                 executor=self._skills_list,
+                parallel_safe=True,
             ),
             ToolDefinition(
                 name="skills_get",
                 capability="skills.get",
                 description="Get a local skill by name and return its instructions.",
-                parameters={
-                    "type": "object",
-                    "properties": {"name": {"type": "string", "description": "Skill name"}},
-                    "required": ["name"],
-                },
+                parameters=_GET_SCHEMA,
                 executor=self._skills_get,
+                parallel_safe=True,
             ),
         ]
 
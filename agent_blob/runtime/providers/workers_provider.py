@@ -3,7 +3,20 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 
 from agent_blob.runtime.capabilities.provider import CapabilityProvider
-from agent_blob.runtime.tools.registry import ToolDefinition
+from agent_blob.runtime.tools.registry import ToolDefinition, object_schema
+
+
+_WORKER_RUN_SCHEMA = object_schema(
+    {
+        "worker_type": {
+            "type": "string",
+            "description": "Worker type: briefing | quant | dev",
+        },
+        "prompt": {"type": "string", "description": "The worker job instruction"},
+        "max_rounds": {"type": "integer", "description": "Max tool-calling rounds", "default": 3},
+    },
+    required=["worker_type", "prompt"],
+)
 
 
 class WorkersProvider:
@@ -30,18 +43,7 @@ class WorkersProvider:
                     "Delegate a task to a specialized sub-agent (worker) and return its result. "
                     "Use this for multitasking and domain-specific work (briefing/quant/dev)."
                 ),
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "worker_type": {
-                            "type": "string",
-                            "description": "Worker type: briefing | quant | dev",
-                        },
-                        "prompt": {"type": "string", "description": "The worker job instruction"},
-                        "max_rounds": {"type": "integer", "description": "Max tool-calling rounds", "default": 3},
-                    },
-                    "required": ["worker_type", "prompt"],
-                },
+                parameters=_WORKER_RUN_SCHEMA,
                 executor=_noop,
             )
         ]
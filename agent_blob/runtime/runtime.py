@@ -5,16 +5,19 @@ import os
 import json
 import time
 import difflib
+import inspect
+import operator
 import re
 from uuid import uuid4
 from dataclasses import dataclass
-from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, List, Tuple
 
 from agent_blob.protocol import EventType, create_event
 from agent_blob.policy.policy import Policy
 from agent_blob.runtime.storage.event_log import EventLog
 from agent_blob.runtime.storage.tasks import TaskStore
 from agent_blob.runtime.storage.scheduler import SchedulerStore
+from agent_blob.runtime.storage.codec import loads as loads_json
 from agent_blob.runtime.llm import OpenAIChatCompletionsProvider
 from agent_blob.runtime.tools.registry import ToolDefinition, ToolRegistry
 from agent_blob.runtime.memory import MemoryService
@@ -36,6 +39,23 @@ from agent_blob.config import (
 
 AskPermission = Callable[..., Awaitable[str]]
 
+# Streamed tokens are coalesced into RUN_TOKEN events of up to ~64 chars or ~20ms worth of deltas.
+TOKEN_FLUSH_CHARS = 64
+TOKEN_FLUSH_INTERVAL_S = 0.02
+
+# Memory extraction runs after the run finishes, on a bounded queue drained by a few workers.
+MEMORY_QUEUE_MAXSIZE = 64
+MEMORY_WORKERS = 3
+
+# Capability instructions rescan skills/MCP config on disk; reuse the assembled system prompt for a while.
+SYSTEM_PROMPT_TTL_S = 30.0
+
+# Smoothing factor for the per-worker-type moving average of observed worker run durations.
+WORKER_DURATION_EWMA_ALPHA = 0.2
+
+# Fields shown per worker in the introspection summary, pulled in one call.
+_WORKER_SUMMARY_FIELDS = operator.itemgetter("workerRunId", "workerType", "parentRunId")
+
 
 @dataclass
 class ToolContext:
@@ -44,6 +64,45 @@ class ToolContext:
     ask_permission: AskPermission
 
 
+class ToolCallAccumulator:
+    """
+    Reassemble streamed tool-call deltas. Calls are indexed by their (small, dense) stream index and
+    name/argument fragments are collected in lists and joined once at the end.
+    """
+
+    def __init__(self):
+        self._ids: List[Optional[str]] = []
+        self._names: List[List[str]] = []
+        self._args: List[List[str]] = []
+
+    def add(self, tc_chunks: Any) -> None:
+        for tc_chunk in tc_chunks:
+            idx = tc_chunk.index
+            while len(self._ids) <= idx:
+                self._ids.append(None)
+                self._names.append([])
+                self._args.append([])
+            if getattr(tc_chunk, "id", None):
+                self._ids[idx] = tc_chunk.id
+            fn = getattr(tc_chunk, "function", None)
+            if fn:
+                if getattr(fn, "name", None):
+                    self._names[idx].append(fn.name)
+                if getattr(fn, "arguments", None):
+                    self._args[idx].append(fn.arguments)
+
+    def tool_calls(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": self._ids[i],
+                "type": "function",
+                "function": {"name": "".join(self._names[i]), "arguments": "".join(self._args[i])},
+            }
+            for i in range(len(self._ids))
+            if self._ids[i] or self._names[i] or self._args[i]
+        ]
+
+
 class Runtime:
     def __init__(self):
         self.event_log = EventLog()
@@ -52,6 +111,12 @@ class Runtime:
         self.schedules = SchedulerStore()
         self._llm = None
         self._active_workers: Dict[str, Dict[str, Any]] = {}
+        self._worker_duration_ewma: Dict[str, float] = {}
+        self._memory_q: Optional[asyncio.Queue] = None
+        self._memory_workers: List[asyncio.Task] = []
+        self._system_prompt_cache: Optional[tuple[float, str]] = None
+        # Start of the window reported as memory_added by the next maintenance pass.
+        self._maintenance_since_ms = int(time.time() * 1000)
         self.capabilities = CapabilityRegistry(
             providers=[
                 LocalProvider(memory=self.memory, schedules=self.schedules),
@@ -63,15 +128,33 @@ class Runtime:
         tool_defs = self.capabilities.tools()
         self._tool_defs_by_name = {t.name: t for t in tool_defs}
         self.tools = ToolRegistry(tool_defs)
+        self._worker_registries: Dict[str, ToolRegistry] = {}
 
     async def startup(self):
         await self.event_log.startup()
         await self.memory.startup()
         await self.tasks.startup()
         await self.schedules.startup()
+        self._memory_q = asyncio.Queue(maxsize=MEMORY_QUEUE_MAXSIZE)
+        self._memory_workers = [asyncio.create_task(self._memory_worker()) for _ in range(MEMORY_WORKERS)]
         # Lazily construct provider on first use so the gateway can start even if OPENAI_API_KEY is not set,
         # as long as the user doesn't send an LLM-backed request.
 
+    async def shutdown(self):
+        if self._memory_q is not None:
+            try:
+                await asyncio.wait_for(self._memory_q.join(), timeout=30)
+            except asyncio.TimeoutError:
+                pass
+        for w in self._memory_workers:
+            w.cancel()
+        await asyncio.gather(*self._memory_workers, return_exceptions=True)
+        self._memory_workers = []
+        if self._llm is not None:
+            await self._llm.aclose()
+        await self.tasks.flush()
+        await self.event_log.close()
+
     async def maintenance(self) -> dict:
         """
         Periodic maintenance hook for the supervisor:
@@ -90,8 +173,10 @@ class Runtime:
         keep_max = int(maint.get("tasks_keep_done_max", 200) or 200)
         purge_stats = await self.tasks.purge_done(keep_days=keep_days, keep_max=keep_max)
 
-        # Consolidation happens during ingest/upsert in MemoryService.
-        added = 0
+        # Consolidation happens during ingest/upsert in MemoryService; report what it added since
+        # the previous pass with one COUNT instead of tracking it per ingest.
+        since_ms, self._maintenance_since_ms = self._maintenance_since_ms, int(time.time() * 1000)
+        added = await self.memory.count_added_since(since_ms=since_ms)
         # Rotate/prune JSONL logs (best-effort).
         events_rot = await self.event_log.rotate_and_prune()
         tasks_events_rot = await self.tasks.rotate_and_prune_events()
@@ -158,13 +243,28 @@ class Runtime:
             }
         )
 
-        yield create_event(EventType.RUN_STATUS, {"runId": run_id, "status": "retrieving_memory"})
-        pinned = await self.memory.get_pinned()
-        recent_turns = await self.event_log.recent_turns(limit=memory_recent_turns_limit())
-        related = await self.event_log.search_turns(user_input, limit=memory_related_turns_limit())
+        # Structured search may embed the query (network-bound); start it first and overlap it with the
+        # local pinned/turn lookups.
         if self._llm is None and os.getenv("OPENAI_API_KEY"):
             self._llm = OpenAIChatCompletionsProvider()
-        structured = await self.memory.search(query=user_input, limit=memory_structured_limit(), llm=self._llm)
+        structured_task = asyncio.create_task(
+            self.memory.search(query=user_input, limit=memory_structured_limit(), llm=self._llm)
+        )
+
+        yield create_event(EventType.RUN_STATUS, {"runId": run_id, "status": "retrieving_memory"})
+        pinned, (recent_turns, related) = await asyncio.gather(
+            self.memory.get_pinned(),
+            self.event_log.recall_turns(
+                user_input,
+                recent_limit=memory_recent_turns_limit(),
+                related_limit=memory_related_turns_limit(),
+            ),
+        )
+        try:
+            structured = await structured_task
+        except Exception as exc:
+            structured = []
+            yield create_event(EventType.RUN_LOG, {"runId": run_id, "message": f"memory search failed: {exc}"})
 
         # Minimal agent loop for V2:
         # - keep explicit smoke-test commands for tools
@@ -180,7 +280,7 @@ class Runtime:
                 yield create_event(EventType.RUN_TOKEN, {"runId": run_id, "content": part})
                 await asyncio.sleep(0)
             await self.event_log.append({"type": "run.output", "runId": run_id, "taskId": task_id, "text": introspection})
-            await self._ingest_memories(run_id=run_id, user_text=user_input, assistant_text=introspection)
+            await self._enqueue_memory_ingest(run_id=run_id, user_text=user_input, assistant_text=introspection)
             await self.tasks.set_status(task_id=task_id, status="open")
             yield create_event(EventType.RUN_FINAL, {"runId": run_id})
             return
@@ -217,12 +317,7 @@ class Runtime:
             return
 
         await self.event_log.append({"type": "run.output", "runId": run_id, "taskId": task_id, "text": assistant_text})
-        mem_stats = await self._ingest_memories(run_id=run_id, user_text=user_input, assistant_text=assistant_text)
-        if mem_stats.get("structured_written"):
-            yield create_event(
-                EventType.RUN_LOG,
-                {"runId": run_id, "message": f"memory saved: structured={mem_stats.get('structured_written')}"},
-            )
+        await self._enqueue_memory_ingest(run_id=run_id, user_text=user_input, assistant_text=assistant_text)
         await self.tasks.set_status(task_id=task_id, status="open")
 
         yield create_event(EventType.RUN_FINAL, {"runId": run_id})
@@ -240,6 +335,43 @@ class Runtime:
         recent_turns: list[dict],
         scheduled_id: str | None = None,
     ) -> list[dict]:
+        # Order stable content first (system prompt, pinned memory, conversation history) and put
+        # per-query context right before the new user message, so consecutive requests share the
+        # longest possible prefix for provider-side prompt caching.
+        msgs: list[dict] = [{"role": "system", "content": self._system_prompt()}]
+        if pinned:
+            msgs.append({"role": "system", "content": f"Pinned memory (authoritative): {pinned}"})
+        for t in recent_turns:
+            u = t.get("user")
+            a = t.get("assistant")
+            if isinstance(u, str) and u:
+                msgs.append({"role": "user", "content": u})
+            if isinstance(a, str) and a:
+                msgs.append({"role": "assistant", "content": a})
+        if structured:
+            msgs.append({"role": "system", "content": f"Structured long-term memories (high confidence): {structured}"})
+        if related:
+            msgs.append({"role": "system", "content": f"Potentially relevant past notes (may be partial): {related}"})
+        if scheduled_id:
+            msgs.append(
+                {
+                    "role": "system",
+                    "content": (
+                        f"This message was triggered by a schedule (id={scheduled_id}).\n"
+                        "Execute the scheduled prompt now.\n"
+                        "Do not suggest \"I can help you set up a schedule\"—the schedule already exists.\n"
+                        "If the prompt requires tools (shell/filesystem/MCP), call the appropriate tools."
+                    ),
+                }
+            )
+        msgs.append({"role": "user", "content": user_input})
+        return msgs
+
+    def _system_prompt(self) -> str:
+        now = time.monotonic()
+        cached = self._system_prompt_cache
+        if cached is not None and cached[0] > now:
+            return cached[1]
         system = (
             "You are Agent Blob, a helpful always-on master AI. Be concise and actionable.\n"
             "Never write to project files or run shell commands just to 'remember' something. Use the memory system instead.\n"
@@ -258,34 +390,30 @@ class Runtime:
         cap_instructions = self.capabilities.system_instructions()
         if cap_instructions:
             system = system + "\n\n" + cap_instructions.strip()
-        msgs: list[dict] = [{"role": "system", "content": system}]
-        if scheduled_id:
-            msgs.append(
-                {
-                    "role": "system",
-                    "content": (
-                        f"This message was triggered by a schedule (id={scheduled_id}).\n"
-                        "Execute the scheduled prompt now.\n"
-                        "Do not suggest \"I can help you set up a schedule\"—the schedule already exists.\n"
-                        "If the prompt requires tools (shell/filesystem/MCP), call the appropriate tools."
-                    ),
-                }
-            )
-        if pinned:
-            msgs.append({"role": "system", "content": f"Pinned memory (authoritative): {pinned}"})
-        if structured:
-            msgs.append({"role": "system", "content": f"Structured long-term memories (high confidence): {structured}"})
-        if related:
-            msgs.append({"role": "system", "content": f"Potentially relevant past notes (may be partial): {related}"})
-        for t in recent_turns:
-            u = t.get("user")
-            a = t.get("assistant")
-            if isinstance(u, str) and u:
-                msgs.append({"role": "user", "content": u})
-            if isinstance(a, str) and a:
-                msgs.append({"role": "assistant", "content": a})
-        msgs.append({"role": "user", "content": user_input})
-        return msgs
+        self._system_prompt_cache = (now + SYSTEM_PROMPT_TTL_S, system)
+        return system
+
+    async def _enqueue_memory_ingest(self, *, run_id: str, user_text: str, assistant_text: str) -> None:
+        """
+        Hand a finished turn to the memory workers. Drops (and logs) the turn if the queue is full.
+        """
+        job = {"run_id": run_id, "user_text": user_text, "assistant_text": assistant_text}
+        if self._memory_q is None:
+            await self._ingest_memories(**job)
+            return
+        try:
+            self._memory_q.put_nowait(job)
+        except asyncio.QueueFull:
+            await self.event_log.append({"type": "memory.ingest_dropped", "runId": run_id, "reason": "queue_full"})
+
+    async def _memory_worker(self) -> None:
+        assert self._memory_q is not None
+        while True:
+            job = await self._memory_q.get()
+            try:
+                await self._ingest_memories(**job)
+            finally:
+                self._memory_q.task_done()
 
     async def _ingest_memories(self, *, run_id: str, user_text: str, assistant_text: str) -> dict:
         """
@@ -330,8 +458,10 @@ class Runtime:
         tools = self.tools.to_openai_tools()
 
         for _round in range(max_rounds):
-            tool_calls_dict: Dict[int, Dict[str, Any]] = {}
-            assistant_delta_text = ""
+            tool_call_acc = ToolCallAccumulator()
+            text_parts: List[str] = []
+            token_buf = ""
+            last_flush = 0.0  # first token goes out immediately
 
             yield create_event(EventType.RUN_STATUS, {"runId": run_id, "status": "streaming"})
             async for chunk in self._llm.stream_chat_chunks(model=model, messages=messages, tools=tools):
@@ -340,28 +470,22 @@ class Runtime:
                 delta = chunk.choices[0].delta
                 content = getattr(delta, "content", None)
                 if content:
-                    assistant_delta_text += content
-                    yield create_event(EventType.RUN_TOKEN, {"runId": run_id, "content": content})
+                    text_parts.append(content)
+                    token_buf += content
+                    now = time.monotonic()
+                    if len(token_buf) >= TOKEN_FLUSH_CHARS or now - last_flush >= TOKEN_FLUSH_INTERVAL_S:
+                        yield create_event(EventType.RUN_TOKEN, {"runId": run_id, "content": token_buf})
+                        token_buf = ""
+                        last_flush = now
 
                 if getattr(delta, "tool_calls", None):
-                    for tc_chunk in delta.tool_calls:
-                        idx = tc_chunk.index
-                        if idx not in tool_calls_dict:
-                            tool_calls_dict[idx] = {
-                                "id": None,
-                                "type": "function",
-                                "function": {"name": "", "arguments": ""},
-                            }
-                        if getattr(tc_chunk, "id", None):
-                            tool_calls_dict[idx]["id"] = tc_chunk.id
-                        fn = getattr(tc_chunk, "function", None)
-                        if fn:
-                            if getattr(fn, "name", None):
-                                tool_calls_dict[idx]["function"]["name"] += fn.name
-                            if getattr(fn, "arguments", None):
-                                tool_calls_dict[idx]["function"]["arguments"] += fn.arguments or ""
-
-            tool_calls = [tool_calls_dict[i] for i in sorted(tool_calls_dict.keys())]
+                    tool_call_acc.add(delta.tool_calls)
+
+            if token_buf:
+                yield create_event(EventType.RUN_TOKEN, {"runId": run_id, "content": token_buf})
+
+            assistant_delta_text = "".join(text_parts)
+            tool_calls = tool_call_acc.tool_calls()
             if not tool_calls:
                 return
 
@@ -370,103 +494,183 @@ class Runtime:
             # Assistant message that contains tool_calls (required for tool results to be accepted).
             messages = messages + [{"role": "assistant", "content": assistant_delta_text or None, "tool_calls": tool_calls}]
 
-            tool_results_msgs: List[Dict[str, Any]] = []
-            for tc in tool_calls:
-                tool_call_id = tc.get("id") or f"tool_{run_id}"
-                tool_name = tc.get("function", {}).get("name", "")
-                raw_args = tc.get("function", {}).get("arguments", "") or ""
-
-                try:
-                    args = json.loads(raw_args) if raw_args else {}
-                except Exception:
-                    args = {}
-                args_exec = dict(args)
-                if tool_name in {"memory_search", "memory_list_recent", "memory_delete"}:
-                    args_exec["_run_id"] = run_id
-
-                try:
-                    tool_def = self.tools.get(tool_name)
-                except Exception:
-                    res = {"ok": False, "error": f"Unknown tool: {tool_name}"}
-                    yield create_event(
-                        EventType.RUN_TOOL_RESULT,
-                        {"runId": run_id, "toolName": tool_name, "ok": False, "result": res},
-                    )
-                    tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
-                    continue
+            # Parallel-safe (read-only) calls are started as soon as they are approved and awaited together
+            # before the next ordered call runs; results are reported in the original tool-call order.
+            tool_results_msgs: List[Optional[Dict[str, Any]]] = []
+            pending: List[Tuple[int, str, str, asyncio.Future]] = []
+            try:
+                for tc in tool_calls:
+                    tool_call_id, tool_name, args, args_exec = self._parse_tool_call(tc, run_id)
+
+                    try:
+                        tool_def = self.tools.get(tool_name)
+                    except Exception:
+                        res = {"ok": False, "error": f"Unknown tool: {tool_name}"}
+                        # Report earlier parallel-safe results first so results stay in tool-call order.
+                        async for ev in self._drain_parallel_tools(run_id, pending, tool_results_msgs):
+                            yield ev
+                        yield create_event(
+                            EventType.RUN_TOOL_RESULT,
+                            {"runId": run_id, "toolName": tool_name, "ok": False, "result": res},
+                        )
+                        tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
+                        continue
+
+                    yield create_event(EventType.RUN_TOOL_CALL, {"runId": run_id, "toolName": tool_name, "arguments": args})
+
+                    # Lightweight schema validation: if required args are missing, don't ask permission or execute.
+                    missing = self._missing_required_args(tool_def, args)
+                    if missing:
+                        res = {"ok": False, "error": f"Missing required arguments: {missing}", "missing": missing}
+                        async for ev in self._drain_parallel_tools(run_id, pending, tool_results_msgs):
+                            yield ev
+                        yield create_event(EventType.RUN_TOOL_RESULT, {"runId": run_id, "toolName": tool_name, **res})
+                        tool_results_msgs.append(
+                            {"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res, ensure_ascii=False)}
+                        )
+                        continue
+
+                    if tool_def.name == "memory_delete" and not self._has_memory_delete_intent(user_input):
+                        res = {
+                            "ok": False,
+                            "error": (
+                                "Blocked: memory.delete requires explicit user intent "
+                                "(e.g. 'forget/delete/remove this memory')."
+                            ),
+                        }
+                        async for ev in self._drain_parallel_tools(run_id, pending, tool_results_msgs):
+                            yield ev
+                        yield create_event(EventType.RUN_TOOL_RESULT, {"runId": run_id, "toolName": tool_name, **res})
+                        tool_results_msgs.append(
+                            {"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res, ensure_ascii=False)}
+                        )
+                        continue
+
+                    await self._authorize_tool_call(tool_ctx, tool_def, args, reason="Tool call")
+
+                    if tool_def.parallel_safe:
+                        fut = asyncio.ensure_future(self._execute_tool(tool_def, args_exec, tool_ctx))
+                        pending.append((len(tool_results_msgs), tool_call_id, tool_name, fut))
+                        tool_results_msgs.append(None)
+                        continue
+
+                    async for ev in self._drain_parallel_tools(run_id, pending, tool_results_msgs):
+                        yield ev
+                    res = await self._execute_tool(tool_def, args_exec, tool_ctx)
 
-                yield create_event(EventType.RUN_TOOL_CALL, {"runId": run_id, "toolName": tool_name, "arguments": args})
-
-                # Lightweight schema validation: if required args are missing, don't ask permission or execute.
-                required = []
-                try:
-                    required = list((tool_def.parameters or {}).get("required") or [])
-                except Exception:
-                    required = []
-                missing = [k for k in required if k not in args]
-                if missing:
-                    res = {"ok": False, "error": f"Missing required arguments: {missing}", "missing": missing}
                     yield create_event(EventType.RUN_TOOL_RESULT, {"runId": run_id, "toolName": tool_name, **res})
                     tool_results_msgs.append(
                         {"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res, ensure_ascii=False)}
                     )
-                    continue
+            except BaseException:
+                # A later call failed authorization (or the run was cancelled): don't leave started calls orphaned.
+                await self._cancel_parallel_tools(pending)
+                raise
 
-                if tool_def.name == "memory_delete" and not self._has_memory_delete_intent(user_input):
-                    res = {
-                        "ok": False,
-                        "error": (
-                            "Blocked: memory.delete requires explicit user intent "
-                            "(e.g. 'forget/delete/remove this memory')."
-                        ),
-                    }
-                    yield create_event(EventType.RUN_TOOL_RESULT, {"runId": run_id, "toolName": tool_name, **res})
-                    tool_results_msgs.append(
-                        {"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res, ensure_ascii=False)}
-                    )
-                    continue
-
-                preview = json.dumps(args, ensure_ascii=False)
-                # For file writes, show a unified diff instead of raw JSON arguments.
-                if tool_def.capability == "filesystem.write":
-                    if tool_def.name == "edit_apply_patch":
-                        preview = await self._preview_edit_apply_patch(args)
-                    else:
-                        preview = await self._preview_filesystem_write(args)
-
-                effective_capability = tool_def.capability
-                # Treat shell commands that modify files as a separate high-risk capability, so users can
-                # allow `shell.run` for safe read-only commands but still be prompted for writes.
-                if tool_def.capability == "shell.run":
-                    cmd = str(args.get("command", "") or "")
-                    if self._shell_command_writes_files(cmd):
-                        effective_capability = "shell.write"
-
-                await self._enforce(
-                    tool_ctx,
-                    effective_capability,
-                    preview=preview,
-                    reason=f"Tool call: {effective_capability}",
-                )
-
-                try:
-                    if tool_def.name == "worker_run":
-                        res = await self._execute_worker_run(args=args_exec, tool_ctx=tool_ctx)
-                    else:
-                        result = await tool_def.executor(args_exec)
-                        res = {"ok": True, "result": result}
-                except Exception as e:
-                    res = {"ok": False, "error": str(e)}
-
-                yield create_event(EventType.RUN_TOOL_RESULT, {"runId": run_id, "toolName": tool_name, **res})
-                tool_results_msgs.append(
-                    {"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res, ensure_ascii=False)}
-                )
-
-            messages = messages + tool_results_msgs
+            async for ev in self._drain_parallel_tools(run_id, pending, tool_results_msgs):
+                yield ev
+            messages = messages + [m for m in tool_results_msgs if m is not None]
 
         yield create_event(EventType.RUN_LOG, {"runId": run_id, "message": "Reached max tool-calling rounds."})
 
+    def _parse_tool_call(self, tc: Dict[str, Any], run_id: str) -> Tuple[str, str, Any, Dict[str, Any]]:
+        """
+        Split an accumulated tool call into (tool_call_id, tool_name, args, args_exec); args_exec is the
+        copy handed to the executor, with the run id injected for memory tools.
+        """
+        tool_call_id = tc.get("id") or f"tool_{run_id}"
+        fn = tc.get("function", {})
+        tool_name = fn.get("name", "")
+        raw_args = fn.get("arguments", "") or ""
+        try:
+            args = loads_json(raw_args) if raw_args else {}
+        except Exception:
+            args = {}
+        args_exec = dict(args)
+        if tool_name in {"memory_search", "memory_list_recent", "memory_delete"}:
+            args_exec["_run_id"] = run_id
+        return tool_call_id, tool_name, args, args_exec
+
+    def _missing_required_args(self, tool_def: ToolDefinition, args: Any) -> List[str]:
+        try:
+            required = list((tool_def.parameters or {}).get("required") or [])
+        except Exception:
+            required = []
+        return [k for k in required if k not in args]
+
+    async def _authorize_tool_call(self, tool_ctx: ToolContext, tool_def: ToolDefinition, args: Any, *, reason: str) -> None:
+        """
+        Ask policy (and, if needed, the user) for permission to run one tool call.
+        """
+        preview = json.dumps(args, ensure_ascii=False)
+        # For file writes, show a unified diff instead of raw JSON arguments.
+        if tool_def.capability == "filesystem.write":
+            if tool_def.name == "edit_apply_patch":
+                preview = await self._preview_edit_apply_patch(args)
+            else:
+                preview = await self._preview_filesystem_write(args)
+
+        effective_capability = tool_def.capability
+        # Treat shell commands that modify files as a separate high-risk capability, so users can
+        # allow `shell.run` for safe read-only commands but still be prompted for writes.
+        if tool_def.capability == "shell.run":
+            cmd = str(args.get("command", "") or "")
+            if self._shell_command_writes_files(cmd):
+                effective_capability = "shell.write"
+
+        await self._enforce(
+            tool_ctx,
+            effective_capability,
+            preview=preview,
+            reason=f"{reason}: {effective_capability}",
+        )
+
+    async def _execute_tool(self, tool_def: ToolDefinition, args_exec: Dict[str, Any], tool_ctx: ToolContext) -> Dict[str, Any]:
+        try:
+            if tool_def.name == "worker_run":
+                return await self._execute_worker_run(args=args_exec, tool_ctx=tool_ctx)
+            # Call the executor directly: a plain-function tool returns its result without any
+            # coroutine being created, and an async one is awaited without an extra wrapper frame.
+            result = tool_def.executor(args_exec)
+            if inspect.isawaitable(result):
+                result = await result
+            return {"ok": True, "result": result}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    async def _drain_parallel_tools(
+        self,
+        run_id: str,
+        pending: List[Tuple[int, str, str, asyncio.Future]],
+        tool_results_msgs: List[Optional[Dict[str, Any]]],
+    ) -> AsyncIterator[dict]:
+        """
+        Await in-flight parallel-safe tool calls, fill their reserved result slots, and emit their results.
+        """
+        if not pending:
+            return
+        batch = list(pending)
+        pending.clear()
+        results = await asyncio.gather(*[fut for _, _, _, fut in batch])
+        for (slot, tool_call_id, tool_name, _), res in zip(batch, results):
+            yield create_event(EventType.RUN_TOOL_RESULT, {"runId": run_id, "toolName": tool_name, **res})
+            tool_results_msgs[slot] = {
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "content": json.dumps(res, ensure_ascii=False),
+            }
+
+    async def _cancel_parallel_tools(self, pending: List[Tuple[int, str, str, asyncio.Future]]) -> None:
+        """
+        Cancel in-flight parallel-safe tool calls and wait for them to finish unwinding.
+        """
+        futs = [fut for _, _, _, fut in pending]
+        pending.clear()
+        for fut in futs:
+            fut.cancel()
+        if futs:
+            await asyncio.gather(*futs, return_exceptions=True)
+
     def _has_memory_delete_intent(self, user_input: str) -> bool:
         q = (user_input or "").strip().lower()
         if not q:
@@ -536,13 +740,12 @@ class Runtime:
         else:
             return {"ok": False, "error": f"Unknown worker_type: {worker_type}"}
 
-        tool_defs = []
-        for name in sorted(allowed):
-            t = self._tool_defs_by_name.get(name)
-            if t:
-                tool_defs.append(t)
-
-        worker_tools = ToolRegistry(tool_defs)
+        # Tool definitions are fixed after __init__, so each worker type's registry (and the OpenAI tool
+        # payload it caches) is built on first use and reused by later workers of that type.
+        worker_tools = self._worker_registries.get(worker_type)
+        if worker_tools is None:
+            tool_defs = [t for name in sorted(allowed) if (t := self._tool_defs_by_name.get(name))]
+            worker_tools = self._worker_registries[worker_type] = ToolRegistry(tool_defs)
         worker_messages = [{"role": "system", "content": system}, {"role": "user", "content": prompt}]
 
         if self._llm is None:
@@ -566,8 +769,10 @@ class Runtime:
             }
         )
         if worker_run_id in self._active_workers:
+            finished_at = time.time()
             self._active_workers[worker_run_id]["status"] = "done"
-            self._active_workers[worker_run_id]["finished_at"] = time.time()
+            self._active_workers[worker_run_id]["finished_at"] = finished_at
+            self._observe_worker_duration(worker_type, finished_at - float(self._active_workers[worker_run_id]["started_at"]))
             self._active_workers[worker_run_id]["output_len"] = len(out_text or "")
             # Keep it for a short time for introspection, but don't grow unbounded.
             # Simple cap: keep most recent 50 records (running or done).
@@ -583,6 +788,13 @@ class Runtime:
                     self._active_workers.pop(k, None)
         return {"ok": True, "result": {"workerRunId": worker_run_id, "workerType": worker_type, "output": out_text}}
 
+    def _observe_worker_duration(self, worker_type: str, duration_s: float) -> None:
+        prev = self._worker_duration_ewma.get(worker_type)
+        if prev is None:
+            self._worker_duration_ewma[worker_type] = duration_s
+        else:
+            self._worker_duration_ewma[worker_type] = WORKER_DURATION_EWMA_ALPHA * duration_s + (1 - WORKER_DURATION_EWMA_ALPHA) * prev
+
     async def _run_agent_loop_collect_text(
         self,
         *,
@@ -602,30 +814,20 @@ class Runtime:
         final_text = ""
 
         for _round in range(max_rounds):
-            tool_calls_dict: Dict[int, Dict[str, Any]] = {}
-            assistant_delta_text = ""
+            tool_call_acc = ToolCallAccumulator()
+            text_parts: List[str] = []
             async for chunk in self._llm.stream_chat_chunks(model=model, messages=messages, tools=tools):
                 if not getattr(chunk, "choices", None):
                     continue
                 delta = chunk.choices[0].delta
                 content = getattr(delta, "content", None)
                 if content:
-                    assistant_delta_text += content
+                    text_parts.append(content)
                 if getattr(delta, "tool_calls", None):
-                    for tc_chunk in delta.tool_calls:
-                        idx = tc_chunk.index
-                        if idx not in tool_calls_dict:
-                            tool_calls_dict[idx] = {"id": None, "type": "function", "function": {"name": "", "arguments": ""}}
-                        if getattr(tc_chunk, "id", None):
-                            tool_calls_dict[idx]["id"] = tc_chunk.id
-                        fn = getattr(tc_chunk, "function", None)
-                        if fn:
-                            if getattr(fn, "name", None):
-                                tool_calls_dict[idx]["function"]["name"] += fn.name
-                            if getattr(fn, "arguments", None):
-                                tool_calls_dict[idx]["function"]["arguments"] += fn.arguments or ""
-
-            tool_calls = [tool_calls_dict[i] for i in sorted(tool_calls_dict.keys())]
+                    tool_call_acc.add(delta.tool_calls)
+
+            assistant_delta_text = "".join(text_parts)
+            tool_calls = tool_call_acc.tool_calls()
             final_text = assistant_delta_text.strip() or final_text
             if not tool_calls:
                 return final_text
@@ -633,69 +835,54 @@ class Runtime:
             # Append assistant tool_calls message
             messages = messages + [{"role": "assistant", "content": assistant_delta_text or None, "tool_calls": tool_calls}]
 
-            tool_results_msgs: List[Dict[str, Any]] = []
-            for tc in tool_calls:
-                tool_call_id = tc.get("id") or f"tool_{run_id}"
-                tool_name = tc.get("function", {}).get("name", "")
-                raw_args = tc.get("function", {}).get("arguments", "") or ""
-                try:
-                    args = json.loads(raw_args) if raw_args else {}
-                except Exception:
-                    args = {}
-                args_exec = dict(args)
-                if tool_name in {"memory_search", "memory_list_recent", "memory_delete"}:
-                    args_exec["_run_id"] = run_id
-
-                # Disallow nested delegation for now.
-                if tool_name == "worker_run":
-                    res = {"ok": False, "error": "Nested worker_run is not supported"}
-                    tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
-                    continue
-
-                try:
-                    tool_def = tools_registry.get(tool_name)
-                except Exception:
-                    res = {"ok": False, "error": f"Unknown worker tool: {tool_name}"}
-                    tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
-                    continue
-
-                required = []
-                try:
-                    required = list((tool_def.parameters or {}).get("required") or [])
-                except Exception:
-                    required = []
-                missing = [k for k in required if k not in args]
-                if missing:
-                    res = {"ok": False, "error": f"Missing required arguments: {missing}", "missing": missing}
-                    tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
-                    continue
-
-                preview = json.dumps(args, ensure_ascii=False)
-                if tool_def.capability == "filesystem.write":
-                    if tool_def.name == "edit_apply_patch":
-                        preview = await self._preview_edit_apply_patch(args)
-                    else:
-                        preview = await self._preview_filesystem_write(args)
-
-                effective_capability = tool_def.capability
-                if tool_def.capability == "shell.run":
-                    cmd = str(args.get("command", "") or "")
-                    if self._shell_command_writes_files(cmd):
-                        effective_capability = "shell.write"
-
-                await self._enforce(tool_ctx, effective_capability, preview=preview, reason=f"Worker tool call: {effective_capability}")
-
-                try:
-                    result = await tool_def.executor(args_exec)
-                    res = {"ok": True, "result": result}
-                except Exception as e:
-                    res = {"ok": False, "error": str(e)}
-
-                tool_results_msgs.append(
-                    {"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res, ensure_ascii=False)}
-                )
+            # Same ordering rules as the streaming loop: parallel-safe calls run together between ordered ones.
+            tool_results_msgs: List[Optional[Dict[str, Any]]] = []
+            pending: List[Tuple[int, str, str, asyncio.Future]] = []
+            try:
+                for tc in tool_calls:
+                    tool_call_id, tool_name, args, args_exec = self._parse_tool_call(tc, run_id)
+
+                    # Disallow nested delegation for now.
+                    if tool_name == "worker_run":
+                        res = {"ok": False, "error": "Nested worker_run is not supported"}
+                        tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
+                        continue
+
+                    try:
+                        tool_def = tools_registry.get(tool_name)
+                    except Exception:
+                        res = {"ok": False, "error": f"Unknown worker tool: {tool_name}"}
+                        tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
+                        continue
+
+                    missing = self._missing_required_args(tool_def, args)
+                    if missing:
+                        res = {"ok": False, "error": f"Missing required arguments: {missing}", "missing": missing}
+                        tool_results_msgs.append({"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res)})
+                        continue
+
+                    await self._authorize_tool_call(tool_ctx, tool_def, args, reason="Worker tool call")
+
+                    if tool_def.parallel_safe:
+                        fut = asyncio.ensure_future(self._execute_tool(tool_def, args_exec, tool_ctx))
+                        pending.append((len(tool_results_msgs), tool_call_id, tool_name, fut))
+                        tool_results_msgs.append(None)
+                        continue
+
+                    async for _ in self._drain_parallel_tools(run_id, pending, tool_results_msgs):
+                        pass
+                    res = await self._execute_tool(tool_def, args_exec, tool_ctx)
+                    tool_results_msgs.append(
+                        {"role": "tool", "tool_call_id": tool_call_id, "content": json.dumps(res, ensure_ascii=False)}
+                    )
+            except BaseException:
+                # A later call failed authorization (or the run was cancelled): don't leave started calls orphaned.
+                await self._cancel_parallel_tools(pending)
+                raise
 
-            messages = messages + tool_results_msgs
+            async for _ in self._drain_parallel_tools(run_id, pending, tool_results_msgs):
+                pass
+            messages = messages + [m for m in tool_results_msgs if m is not None]
 
         return final_text
 
@@ -862,45 +1049,30 @@ class Runtime:
 
         out = []
         if wants_tasks:
-            tasks = await self.tasks.list_tasks()
-            now = time.time()
-            window_s = tasks_attach_window_s()
-            always_active = {"running", "waiting_permission", "waiting_user"}
-            active = []
-            for t in tasks:
-                status = str(t.get("status") or "")
-                if status in ("done", "cancelled", "failed"):
-                    continue
-                updated = float(t.get("updated_at", 0) or 0)
-                if status in always_active or (now - updated) <= window_s:
-                    active.append(t)
+            active = await self.tasks.list_active(window_s=tasks_attach_window_s())
             out.append(f"Active tasks: {len(active)}")
-            for t in active[:10]:
-                out.append(f"- {t.get('id')}: {t.get('status')} — {t.get('title')}")
+            out.extend(f"- {t.get('id')}: {t.get('status')} — {t.get('title')}" for t in active[:10])
             if not active:
                 out.append("- (none)")
 
         if wants_schedule:
             schedules = await self.schedules.list_schedules()
             out.append(f"Scheduled jobs: {len(schedules)}")
-            for s in schedules[:10]:
-                out.append(f"- {s.get('id','(no id)')}: next_run_at={s.get('next_run_at')}")
+            out.extend(f"- {s.get('id','(no id)')}: next_run_at={s.get('next_run_at')}" for s in schedules[:10])
             if not schedules:
                 out.append("- (none)")
 
         if wants_memory:
-            pinned = await self.memory.get_pinned()
-            recent = await self.memory.list_recent(limit=memory_introspection_limit())
+            pinned, (recent, total) = await asyncio.gather(
+                self.memory.get_pinned(),
+                self.memory.list_recent_page(limit=memory_introspection_limit()),
+            )
             out.append(f"Pinned memory items: {len(pinned)}")
-            for p in pinned[:10]:
-                if isinstance(p, dict):
-                    out.append(f"- {p.get('content')}")
+            out.extend(f"- {p.get('content')}" for p in pinned[:10] if isinstance(p, dict))
             if not pinned:
                 out.append("- (none)")
-            out.append(f"Recent structured memories: {len(recent)}")
-            for m in recent[:10]:
-                if isinstance(m, dict):
-                    out.append(f"- ({m.get('type')}) {m.get('content')}")
+            out.append(f"Recent structured memories: {len(recent)} (of {total} total)")
+            out.extend(f"- ({m.get('type')}) {m.get('content')}" for m in recent[:10] if isinstance(m, dict))
             if not recent:
                 out.append("- (none)")
 
@@ -910,21 +1082,22 @@ class Runtime:
             results = await self.memory.search(query=user_input, limit=memory_introspection_limit(), llm=self._llm)
             out.append("Memory search results:")
             if results:
-                for m in results[:10]:
-                    if isinstance(m, dict):
-                        out.append(f"- ({m.get('type')}) {m.get('content')}")
+                out.extend(f"- ({m.get('type')}) {m.get('content')}" for m in results[:10] if isinstance(m, dict))
             else:
                 out.append("- (no matches)")
                 out.append("Tip: try a couple more keywords (project name, module name, date).")
 
         if wants_workers:
-            rows = list(self._active_workers.values())
-            running = [r for r in rows if isinstance(r, dict) and r.get("status") == "running"]
+            running = [r for r in self._active_workers.values() if isinstance(r, dict) and r.get("status") == "running"]
             out.append(f"Active workers: {len(running)}")
-            for r in running[:10]:
-                out.append(f"- {r.get('workerRunId')}: {r.get('workerType')} (parent={r.get('parentRunId')})")
+            out.extend(
+                f"- {wid}: {wtype} (parent={parent})" for wid, wtype, parent in map(_WORKER_SUMMARY_FIELDS, running[:10])
+            )
             if not running:
                 out.append("- (none)")
+            if self._worker_duration_ewma:
+                typical = ", ".join(f"{k} ~{v:.0f}s" for k, v in sorted(self._worker_duration_ewma.items()))
+                out.append(f"Typical worker duration: {typical}")
 
         return "\n".join(out) + "\n"
 
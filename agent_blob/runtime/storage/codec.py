@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:  # optional: C-accelerated JSON for the JSONL hot paths
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def dumps_line(obj: Any) -> bytes:
+    """
+    Encode one JSONL record as UTF-8 bytes, including the trailing newline.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """
+    Encode a JSON document as UTF-8 bytes (optionally 2-space indented, for hand-readable state files).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,39 +1,135 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
+import math
+import os
+import re
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from .codec import dumps_line, loads
 from .paths import data_dir, memory_dir
-from .jsonl_archive import rotate_jsonl, prune_archives
+from .jsonl_archive import ArchiveRecord, recent_archives, rotate_jsonl, prune_archives
 from agent_blob import config
 
 
+logger = logging.getLogger("agent_blob.events")
+
+# Word tokens used for both the query and the turn text in search_turns().
+_TERM_RE = re.compile(r"\w+")
+
+# Okapi BM25 parameters for ranking reconstructed turns (the usual FTS defaults).
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+# Number of reconstructed turns that keyword search ranks over.
+SEARCH_TURNS_SCAN = 200
+
+
 class EventLog:
     def __init__(self):
         self._memory_dir = memory_dir()
         self._legacy_data_dir = data_dir()
         self._path = self._memory_dir / "events.jsonl"
+        # Appends are queued and drained by a single writer task that keeps an O_APPEND fd open
+        # and coalesces bursts of events (e.g. one per tool call) into one os.write().
+        self._queue: Optional[asyncio.Queue[bytes]] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._fd: Optional[int] = None
+        # Size of the active file as seen by the writer; when it crosses the rotation threshold the
+        # writer rolls it into archives/ itself instead of waiting for the next maintenance pass.
+        self._size = 0
+        self._max_bytes = config.log_max_bytes("events", 20_000_000)
 
     async def startup(self) -> None:
         self._migrate_legacy_events()
+        # No need to pre-create events.jsonl: the writer opens it with O_CREAT on the first append.
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        if not self._path.exists():
-            self._path.write_text("", encoding="utf-8")
 
     async def append(self, event: Dict[str, Any]) -> None:
-        line = json.dumps(event, ensure_ascii=False)
-        with self._path.open("a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        line = dumps_line(event)
+        await self._ensure_writer().put(line)
+
+    async def flush(self) -> None:
+        """
+        Wait until every queued event has been written.
+        """
+        if self._queue is not None and self._writer is not None and not self._writer.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._writer = None
+        self._close_handle(sync=True)
+
+    def _ensure_writer(self) -> asyncio.Queue[bytes]:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._writer_loop(self._queue))
+        return self._queue
+
+    async def _writer_loop(self, queue: asyncio.Queue[bytes]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            lines = [await queue.get()]
+            while not queue.empty():
+                lines.append(queue.get_nowait())
+            try:
+                data = b"".join(lines)
+                # Retry once on a fresh fd (e.g. the file was moved or the handle went bad).
+                for attempt in range(2):
+                    try:
+                        self._open_handle()
+                        await loop.run_in_executor(None, _write_all, self._fd, data)
+                        break
+                    except Exception:
+                        self._close_handle()
+                        if attempt:
+                            logger.exception("failed to append %d event(s) to %s", len(lines), self._path)
+                            data = b""
+                self._size += len(data)
+                if data and self._max_bytes > 0 and self._size >= self._max_bytes:
+                    self._close_handle()
+                    try:
+                        await loop.run_in_executor(None, self._rotate)
+                    except Exception:
+                        logger.exception("failed to rotate %s", self._path)
+            finally:
+                # Always account for the batch so flush() can't hang on a failed write.
+                for _ in lines:
+                    queue.task_done()
+
+    def _open_handle(self) -> None:
+        if self._fd is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._size = os.fstat(self._fd).st_size
+
+    def _close_handle(self, *, sync: bool = False) -> None:
+        if self._fd is not None:
+            try:
+                if sync:
+                    os.fsync(self._fd)
+            except Exception:
+                pass
+            try:
+                os.close(self._fd)
+            except Exception:
+                pass
+            self._fd = None
 
     async def rotate_and_prune(self) -> Dict[str, Any]:
-        rec = rotate_jsonl(
-            data_dir=self._memory_dir,
-            kind="events",
-            active_path=self._path,
-            max_bytes=config.log_max_bytes("events", 20_000_000),
-        )
+        # Drain pending writes and release the handle so rotation doesn't keep appending to the archive.
+        await self.flush()
+        self._close_handle()
+        rec = self._rotate()
         pruned = prune_archives(
             data_dir=self._memory_dir,
             kind="events",
@@ -42,107 +138,116 @@ class EventLog:
         )
         return {"rotated": bool(rec), "pruned": pruned}
 
+    def _rotate(self) -> Optional[ArchiveRecord]:
+        return rotate_jsonl(
+            data_dir=self._memory_dir,
+            kind="events",
+            active_path=self._path,
+            max_bytes=self._max_bytes,
+        )
+
     async def recent_turns(self, limit: int = 8) -> List[Dict[str, Any]]:
         """
         Reconstruct recent user/assistant turns from run.input/run.output events.
         Best-effort and bounded: scans only the last ~2000 events across the active log and recent archives.
         """
-        if not self._path.exists():
-            return []
-
-        last_lines: deque[str] = deque(maxlen=2000)
-        for line in self._iter_tail_lines(max_lines=2000):
-            last_lines.append(line)
-
-        by_run: Dict[str, Dict[str, Any]] = {}
-        ordered: List[str] = []
-        for raw in last_lines:
+        await self.flush()
+        # Walk events newest-first and stop as soon as `limit` complete turns are known. Columnar
+        # accumulation (one slot per run across parallel lists) keeps the scan allocation-light; a
+        # run's turn is complete once its run.input (its earliest event) has been seen.
+        cap = limit if limit > 0 else None
+        slot: Dict[str, int] = {}
+        run_ids: List[str] = []
+        users: List[Any] = []
+        assistants: List[Any] = []
+        task_ids: List[Any] = []
+        complete: List[int] = []  # slots in completion order (newest turn first)
+        done: set[int] = set()
+        for raw in self._iter_tail_lines_reversed(max_lines=2000):
             raw = raw.strip()
             if not raw:
                 continue
             try:
-                ev = json.loads(raw)
+                ev = loads(raw)
             except Exception:
                 continue
             r = ev.get("runId")
             t = ev.get("type")
-            if not isinstance(r, str) or not isinstance(t, str):
+            if t not in ("run.input", "run.output") or not isinstance(r, str):
                 continue
-            if r not in by_run:
-                by_run[r] = {"runId": r}
-                ordered.append(r)
+            i = slot.get(r)
+            if i is None:
+                i = slot[r] = len(run_ids)
+                run_ids.append(r)
+                users.append(None)
+                assistants.append(None)
+                task_ids.append(None)
+            # Newest-first: the first value seen for a field is the latest one.
+            if t == "run.input":
+                if users[i] is None:
+                    users[i] = ev.get("input", "")
+            elif assistants[i] is None:
+                assistants[i] = ev.get("text", "")
+            if task_ids[i] is None and "taskId" in ev:
+                task_ids[i] = ev.get("taskId")
             if t == "run.input":
-                by_run[r]["user"] = ev.get("input", "")
-                if "taskId" in ev:
-                    by_run[r]["taskId"] = ev.get("taskId")
-            elif t == "run.output":
-                by_run[r]["assistant"] = ev.get("text", "")
-                if "taskId" in ev:
-                    by_run[r]["taskId"] = ev.get("taskId")
+                user = users[i]
+                assistant = assistants[i]
+                if isinstance(user, str) and isinstance(assistant, str) and user and assistant and i not in done:
+                    done.add(i)
+                    complete.append(i)
+                    if cap is not None and len(complete) >= cap:
+                        break
 
         turns: List[Dict[str, Any]] = []
-        for r in ordered:
-            rec = by_run.get(r) or {}
-            user = rec.get("user")
-            assistant = rec.get("assistant")
-            if isinstance(user, str) and isinstance(assistant, str) and user and assistant:
-                t = {"runId": r, "user": user, "assistant": assistant}
-                if rec.get("taskId"):
-                    t["taskId"] = rec.get("taskId")
-                turns.append(t)
-
-        return turns[-limit:]
+        for i in reversed(complete):
+            t = {"runId": run_ids[i], "user": users[i], "assistant": assistants[i]}
+            if task_ids[i]:
+                t["taskId"] = task_ids[i]
+            turns.append(t)
+        return turns
 
     async def search_turns(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Best-effort keyword search over recent reconstructed turns.
         Scans the same bounded tail as recent_turns().
         """
-        q = (query or "").lower().strip()
-        if not q:
+        if not _TERM_RE.search(query or ""):
             return []
-        turns = await self.recent_turns(limit=200)  # bounded by internal scan
-        q_terms = [t for t in q.replace(".", " ").replace(",", " ").split() if t]
-        scored: List[Tuple[float, Dict[str, Any]]] = []
-        n = max(1, len(turns))
-        for i, t in enumerate(turns):
-            u = str(t.get("user", "")).lower()
-            a = str(t.get("assistant", "")).lower()
-            hay = f"{u}\n{a}"
-            if q not in hay and not any(term in hay for term in q_terms):
-                continue
-            overlap = sum(1 for term in q_terms if term in hay)
-            recency = float(i) / float(n)  # newer turns have higher i
-            scored.append((overlap * 3.0 + recency, t))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [t for _, t in scored[:limit]]
+        turns = await self.recent_turns(limit=SEARCH_TURNS_SCAN)  # bounded by internal scan
+        return _rank_turns(turns, query, limit)
+
+    async def recall_turns(
+        self, query: str, *, recent_limit: int = 8, related_limit: int = 5
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        recent_turns() and search_turns() from a single reconstruction of the log tail:
+        returns (the newest recent_limit turns, the related_limit best matches for query).
+        """
+        scan = max(SEARCH_TURNS_SCAN, recent_limit) if recent_limit > 0 else 0
+        turns = await self.recent_turns(limit=scan)
+        recent = turns[-recent_limit:] if recent_limit > 0 else turns
+        return recent, _rank_turns(turns, query, related_limit)
 
-    def _iter_tail_lines(self, *, max_lines: int) -> List[str]:
+    def _iter_tail_lines_reversed(self, *, max_lines: int) -> Iterator[str]:
         """
-        Read a bounded tail of lines across the active log and most recent archives.
+        Yield up to max_lines lines newest-first across the active log and most recent archives.
         """
         max_lines = max(0, int(max_lines))
         if max_lines <= 0:
-            return []
+            return
 
-        files: List[Path] = []
-        arch = (self._memory_dir / "archives")
-        if arch.exists():
-            candidates = sorted(arch.glob("events_*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
-            recent = candidates[:5]  # cap: search up to 5 recent archives
-            files.extend(list(reversed(recent)))  # chronological: oldest -> newest
-        files.append(self._path)
+        files: List[Path] = [self._path]
+        if (self._memory_dir / "archives").exists():
+            files.extend(recent_archives(self._memory_dir, "events", limit=5))  # cap: up to 5 recent archives
 
-        out: deque[str] = deque()
-        remaining = max_lines
+        n = 0
         for p in files:
-            lines = _tail_lines(p, remaining)
-            for line in lines:
-                out.append(line)
-            remaining = max_lines - len(out)
-            if remaining <= 0:
-                break
-        return list(out)[-max_lines:]
+            for line in _iter_lines_reversed(p):
+                yield line
+                n += 1
+                if n >= max_lines:
+                    return
 
     def _migrate_legacy_events(self) -> None:
         legacy_events = self._legacy_data_dir / "events.jsonl"
@@ -168,33 +273,74 @@ class EventLog:
                 continue
 
 
-def _tail_lines(path: Path, max_lines: int, block_size: int = 64 * 1024) -> List[str]:
-    """
-    Efficiently read the last max_lines lines of a text file.
-    """
-    max_lines = max(0, int(max_lines))
-    if max_lines <= 0 or not path.exists():
+def _rank_turns(turns: List[Dict[str, Any]], query: str, limit: int) -> List[Dict[str, Any]]:
+    q_terms = set(_TERM_RE.findall((query or "").lower()))
+    if not q_terms:
         return []
+    # Tokenize each turn once and rank prefix matches with BM25 (what an FTS5 `term*` MATCH would
+    # give) instead of probing every query term as a substring of every turn. A term counts for any
+    # word that starts with it, so "deploy" still finds "deployment".
+    docs: List[Tuple[int, Dict[str, int], int]] = []
+    df: Dict[str, int] = dict.fromkeys(q_terms, 0)
+    # Query terms each distinct word starts with; words repeat heavily across turns.
+    word_terms: Dict[str, Tuple[str, ...]] = {}
+    total_len = 0
+    for i, t in enumerate(turns):
+        words = _TERM_RE.findall(f"{t.get('user', '')}\n{t.get('assistant', '')}".lower())
+        total_len += len(words)
+        tf: Dict[str, int] = {}
+        for w in words:
+            hits = word_terms.get(w)
+            if hits is None:
+                hits = word_terms[w] = tuple(q for q in q_terms if w.startswith(q))
+            for q in hits:
+                tf[q] = tf.get(q, 0) + 1
+        if tf:
+            for w in tf:
+                df[w] += 1
+            docs.append((i, tf, len(words)))
+    n = len(turns)
+    avg_len = total_len / n if n else 0.0
+    idf = {w: math.log(1.0 + (n - c + 0.5) / (c + 0.5)) for w, c in df.items() if c}
+    scored: List[Tuple[float, int]] = []
+    for i, tf, dl in docs:
+        norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * dl / avg_len) if avg_len else _BM25_K1
+        score = sum(idf[w] * f * (_BM25_K1 + 1.0) / (f + norm) for w, f in tf.items())
+        scored.append((score, i))  # ties go to newer turns (higher i)
+    scored.sort(reverse=True)
+    return [turns[i] for _, i in scored[:limit]]
 
-    data = b""
-    try:
-        with path.open("rb") as f:
-            f.seek(0, 2)
-            end = f.tell()
-            pos = end
-            while pos > 0 and data.count(b"\n") <= max_lines:
-                read_size = min(block_size, pos)
-                pos -= read_size
-                f.seek(pos)
-                data = f.read(read_size) + data
-                if pos == 0:
-                    break
-    except Exception:
-        return []
 
+def _write_all(fd: int, data: bytes) -> None:
+    # os.write may write fewer bytes than requested; loop until the whole batch is on disk.
+    view = memoryview(data)
+    while view:
+        n = os.write(fd, view)
+        view = view[n:]
+
+
+def _iter_lines_reversed(path: Path, block_size: int = 64 * 1024) -> Iterator[str]:
+    """
+    Lazily yield a text file's lines last-to-first, reading fixed-size blocks backwards from the end.
+    """
     try:
-        text = data.decode("utf-8", errors="replace")
-    except Exception:
-        return []
-    lines = text.splitlines()
-    return lines[-max_lines:]
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        pos = os.fstat(fd).st_size
+        carry = b""
+        while pos > 0:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            chunk = os.pread(fd, read_size, pos) + carry
+            lines = chunk.split(b"\n")
+            # The first piece may be the tail end of a line that continues in the previous block.
+            carry = lines[0]
+            for raw in reversed(lines[1:]):
+                if raw:
+                    yield raw.decode("utf-8", errors="replace")
+        if carry:
+            yield carry.decode("utf-8", errors="replace")
+    finally:
+        os.close(fd)
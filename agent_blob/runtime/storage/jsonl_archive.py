@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from .codec import dumps, loads
 
 
 @dataclass(frozen=True)
@@ -28,10 +29,8 @@ def index_path(data_dir: Path) -> Path:
 
 def _load_index(data_dir: Path) -> Dict[str, Any]:
     p = index_path(data_dir)
-    if not p.exists():
-        return {"archives": []}
     try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
+        obj = loads(p.read_bytes())
         if isinstance(obj, dict) and isinstance(obj.get("archives"), list):
             return obj
     except Exception:
@@ -41,7 +40,7 @@ def _load_index(data_dir: Path) -> Dict[str, Any]:
 
 def _save_index(data_dir: Path, obj: Dict[str, Any]) -> None:
     p = index_path(data_dir)
-    p.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+    p.write_bytes(dumps(obj))
 
 
 def append_index_record(data_dir: Path, rec: ArchiveRecord) -> None:
@@ -59,6 +58,27 @@ def append_index_record(data_dir: Path, rec: ArchiveRecord) -> None:
     _save_index(data_dir, idx)
 
 
+def recent_archives(data_dir: Path, kind: str, *, limit: int) -> List[Path]:
+    """
+    Most recent archive files of a given kind (newest first), read from archives/index.json.
+    Falls back to a directory scan when the index doesn't exist yet.
+    """
+    limit = max(0, int(limit))
+    if limit <= 0:
+        return []
+    d = data_dir / "archives"
+    prefix = f"{kind}_"
+    if not index_path(data_dir).exists():
+        return [p for p, _ in _scan_jsonl(d) if p.name.startswith(prefix)][:limit]
+    entries = [
+        a
+        for a in (_load_index(data_dir).get("archives") or [])
+        if isinstance(a, dict) and Path(str(a.get("path") or "")).name.startswith(prefix)
+    ]
+    entries.sort(key=lambda a: int(a.get("rotated_at_ms", 0) or 0), reverse=True)
+    return [Path(str(a["path"])) for a in entries[:limit]]
+
+
 def rotate_jsonl(
     *,
     data_dir: Path,
@@ -73,9 +93,6 @@ def rotate_jsonl(
     max_bytes = int(max_bytes or 0)
     if max_bytes <= 0:
         return None
-    if not active_path.exists():
-        return None
-
     try:
         size = active_path.stat().st_size
     except Exception:
@@ -87,10 +104,14 @@ def rotate_jsonl(
     rotated_at_ms = int(time.time() * 1000)
     ts = time.strftime("%Y%m%d_%H%M%S", time.localtime(rotated_at_ms / 1000.0))
     dst = archives_dir(data_dir) / f"{kind}_{ts}.jsonl"
+    n = 1
+    while dst.exists():  # never clobber an archive rotated within the same second
+        dst = archives_dir(data_dir) / f"{kind}_{ts}_{n}.jsonl"
+        n += 1
 
-    # Atomic-ish rename; then recreate an empty active file.
+    # Atomic-ish rename. The active file is not recreated here: every writer opens it in append
+    # mode, which creates it together with the first new record.
     active_path.rename(dst)
-    active_path.write_text("", encoding="utf-8")
 
     rec = ArchiveRecord(kind=kind, path=str(dst), rotated_at_ms=rotated_at_ms, bytes=size)
     append_index_record(data_dir, rec)
@@ -112,17 +133,22 @@ def prune_archives(
     keep_max_files = max(0, int(keep_max_files or 0))
 
     d = archives_dir(data_dir)
-    files = sorted(d.glob(f"{kind}_*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+    # One directory pass; each entry is stat'ed once and reused for pruning and the index rebuild.
+    scanned = _scan_jsonl(d)
+    prefix = f"{kind}_"
+    files = [(p, st) for p, st in scanned if p.name.startswith(prefix)]
 
     now = time.time()
     cutoff = now - (keep_days * 86400) if keep_days else None
 
     kept: List[Path] = []
+    gone: set[Path] = set()
     removed = 0
-    for p in files:
-        if cutoff is not None and p.stat().st_mtime < cutoff:
+    for p, st in files:
+        if cutoff is not None and st.st_mtime < cutoff:
             try:
                 p.unlink()
+                gone.add(p)
                 removed += 1
             except Exception:
                 kept.append(p)
@@ -133,6 +159,7 @@ def prune_archives(
         for p in kept[keep_max_files:]:
             try:
                 p.unlink()
+                gone.add(p)
                 removed += 1
             except Exception:
                 pass
@@ -141,16 +168,34 @@ def prune_archives(
     # Rebuild index best-effort (simple and reliable).
     idx = _load_index(data_dir)
     archives = []
-    for p in sorted(d.glob("*.jsonl"), key=lambda x: x.stat().st_mtime, reverse=True):
+    for p, st in scanned:
+        if p in gone:
+            continue
         stem = p.stem
         k = stem.split("_", 1)[0] if "_" in stem else "unknown"
-        try:
-            st = p.stat()
-            archives.append({"kind": k, "path": str(p), "rotated_at_ms": int(st.st_mtime * 1000), "bytes": st.st_size})
-        except Exception:
-            continue
+        archives.append({"kind": k, "path": str(p), "rotated_at_ms": int(st.st_mtime * 1000), "bytes": st.st_size})
     idx["archives"] = archives
     _save_index(data_dir, idx)
 
     return {"removed": removed, "kept": len(kept)}
 
+
+def _scan_jsonl(d: Path) -> List[Tuple[Path, os.stat_result]]:
+    """
+    (path, stat) for every *.jsonl in d, newest first.
+    """
+    out: List[Tuple[Path, os.stat_result]] = []
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                if not e.name.endswith(".jsonl"):
+                    continue
+                try:
+                    if e.is_file():
+                        out.append((Path(e.path), e.stat()))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    out.sort(key=lambda x: x[1].st_mtime, reverse=True)
+    return out
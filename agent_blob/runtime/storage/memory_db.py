@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import re
 import sqlite3
 import time
 import hashlib
@@ -10,6 +11,19 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
+# Word tokens of a free-text query; each becomes a quoted FTS5 term so punctuation can't break MATCH.
+_FTS_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_match_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression: distinct quoted terms OR-ed together, so bm25()
+    ranks rows by how many (and how rare) terms they contain.
+    """
+    terms = dict.fromkeys(t.lower() for t in _FTS_TERM_RE.findall(text or ""))
+    return " OR ".join(f'"{t}"' for t in terms)
+
+
 def _fingerprint(mem_type: str, content: str) -> str:
     norm = " ".join((content or "").strip().lower().split())
     raw = f"{mem_type}:{norm}".encode("utf-8")
@@ -27,7 +41,38 @@ def _unpack_f32(blob: bytes) -> List[float]:
     return list(struct.unpack(f"<{n}f", blob[: n * 4]))
 
 
-def _cosine(a: List[float], b: List[float]) -> float:
+def _tags(tags_json: Optional[str]) -> List[str]:
+    try:
+        return list(json.loads(tags_json or "[]") or [])
+    except Exception:
+        return []
+
+
+# Columns behind the full item view returned by get/pop_by_fingerprint, and the statements that read them.
+_ITEM_COLUMNS = "fingerprint, type, content, context, importance, tags_json, first_seen_ms, last_seen_ms, count, last_run_id"
+_GET_ITEM_SQL = f"SELECT {_ITEM_COLUMNS} FROM memory_items WHERE fingerprint = ?"
+_POP_ITEM_SQL = f"DELETE FROM memory_items WHERE fingerprint = ? RETURNING {_ITEM_COLUMNS}"
+
+
+def _item(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "id": str(row["fingerprint"]),
+        "type": str(row["type"]),
+        "content": str(row["content"]),
+        "context": str(row["context"]),
+        "importance": int(row["importance"] or 0),
+        "tags": _tags(row["tags_json"]),
+        "first_seen_ms": int(row["first_seen_ms"] or 0),
+        "last_seen_ms": int(row["last_seen_ms"] or 0),
+        "count": int(row["count"] or 0),
+        "last_run_id": str(row["last_run_id"] or ""),
+    }
+
+
+def cosine(a: List[float], b: List[float]) -> float:
+    """
+    Cosine similarity of two embeddings; 0.0 for empty, mismatched or zero-norm vectors.
+    """
     if not a or not b or len(a) != len(b):
         return 0.0
     dot = 0.0
@@ -72,11 +117,16 @@ class MemoryDB:
 
     def _connect(self) -> sqlite3.Connection:
         if self._con is None:
-            con = sqlite3.connect(str(self.path))
+            # Variable-length IN (...) lists in the search paths each compile to a distinct statement;
+            # a larger cache keeps the fixed hot statements from being evicted by them.
+            con = sqlite3.connect(str(self.path), cached_statements=256)
             con.row_factory = sqlite3.Row
             con.execute("PRAGMA journal_mode=WAL")
             con.execute("PRAGMA synchronous=NORMAL")
             con.execute("PRAGMA temp_store=MEMORY")
+            # Larger page cache and memory-mapped reads for the full-table vector/BM25 scans.
+            con.execute("PRAGMA cache_size=-65536")
+            con.execute("PRAGMA mmap_size=268435456")
             self._con = con
         return self._con
 
@@ -144,78 +194,74 @@ class MemoryDB:
         row = cur.fetchone()
         return int(row["n"] if row else 0)
 
+    def count_added_since(self, since_ms: int) -> int:
+        con = self._connect()
+        cur = con.execute("SELECT COUNT(*) AS n FROM memory_items WHERE first_seen_ms >= ?", (int(since_ms),))
+        row = cur.fetchone()
+        return int(row["n"] if row else 0)
+
     def delete_by_fingerprint(self, fingerprint: str) -> bool:
+        return self.pop_by_fingerprint(fingerprint) is not None
+
+    def pop_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Delete a memory and return the removed item in the same statement (DELETE ... RETURNING),
+        so callers that need the old row don't have to SELECT it first.
+        """
         fp = str(fingerprint or "").strip()
         if not fp:
-            return False
+            return None
         con = self._connect()
-        cur = con.execute("DELETE FROM memory_items WHERE fingerprint = ?", (fp,))
+        cur = con.execute(_POP_ITEM_SQL, (fp,))
+        row = cur.fetchone()
         con.commit()
-        return cur.rowcount > 0
+        return _item(row) if row else None
 
     def get_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
         fp = str(fingerprint or "").strip()
         if not fp:
             return None
         con = self._connect()
-        cur = con.execute(
-            """
-            SELECT fingerprint, type, content, context, importance, tags_json, first_seen_ms, last_seen_ms, count, last_run_id
-            FROM memory_items
-            WHERE fingerprint = ?
-            """,
-            (fp,),
-        )
+        cur = con.execute(_GET_ITEM_SQL, (fp,))
         row = cur.fetchone()
-        if not row:
-            return None
-        try:
-            tags = json.loads(row["tags_json"] or "[]")
-        except Exception:
-            tags = []
-        return {
-            "id": str(row["fingerprint"]),
-            "type": str(row["type"]),
-            "content": str(row["content"]),
-            "context": str(row["context"]),
-            "importance": int(row["importance"] or 0),
-            "tags": list(tags or []),
-            "first_seen_ms": int(row["first_seen_ms"] or 0),
-            "last_seen_ms": int(row["last_seen_ms"] or 0),
-            "count": int(row["count"] or 0),
-            "last_run_id": str(row["last_run_id"] or ""),
-        }
+        return _item(row) if row else None
 
     def list_recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self.list_recent_page(limit)[0]
+
+    def list_recent_page(self, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Most recently seen items plus the total item count, from one statement: COUNT(*) OVER ()
+        attaches the table-wide count to every page row instead of running a second COUNT query.
+        """
+        if int(limit) <= 0:
+            return [], self.count_items()
         con = self._connect()
-        cur = con.execute(
+        rows = con.execute(
             """
-            SELECT fingerprint, type, content, context, importance, tags_json, last_seen_ms, count
+            SELECT fingerprint, type, content, context, importance, tags_json, last_seen_ms, count,
+                   COUNT(*) OVER () AS total
             FROM memory_items
             ORDER BY last_seen_ms DESC
             LIMIT ?
             """,
             (int(limit),),
-        )
-        out: List[Dict[str, Any]] = []
-        for r in cur.fetchall():
-            try:
-                tags = json.loads(r["tags_json"] or "[]")
-            except Exception:
-                tags = []
-            out.append(
-                {
-                    "id": str(r["fingerprint"]),
-                    "type": str(r["type"]),
-                    "content": str(r["content"]),
-                    "context": str(r["context"]),
-                    "importance": int(r["importance"] or 0),
-                    "tags": list(tags or []),
-                    "last_seen_ms": int(r["last_seen_ms"] or 0),
-                    "count": int(r["count"] or 0),
-                }
-            )
-        return out
+        ).fetchall()
+        # Unpack rows positionally (one pass, no per-column name lookups).
+        items = [
+            {
+                "id": str(fp),
+                "type": str(typ),
+                "content": str(content),
+                "context": str(context),
+                "importance": int(importance or 0),
+                "tags": _tags(tags_json),
+                "last_seen_ms": int(last_seen_ms or 0),
+                "count": int(count or 0),
+            }
+            for fp, typ, content, context, importance, tags_json, last_seen_ms, count, _ in rows
+        ]
+        return items, int(rows[0]["total"]) if rows else 0
 
     def upsert_many(self, *, run_id: str, memories: List[Dict[str, Any]]) -> int:
         """
@@ -239,6 +285,7 @@ class MemoryDB:
         added: List[Dict[str, Any]] = []
         modified: List[Dict[str, Any]] = []
 
+        items: List[Tuple[str, str, str, str, int, List[Any], str]] = []
         for m in memories:
             mem_type = str(m.get("type", "") or "").strip()
             content = str(m.get("content", "") or "").strip()
@@ -248,12 +295,24 @@ class MemoryDB:
             importance = int(m.get("importance", 0) or 0)
             tags = list(m.get("tags") or [])
             tags_json = json.dumps(sorted({str(t) for t in tags if str(t).strip()}), ensure_ascii=False)
-            fp = _fingerprint(mem_type, content)
+            items.append((_fingerprint(mem_type, content), mem_type, content, context, importance, tags, tags_json))
+
+        # Look up every existing row in one query instead of one SELECT per memory. The map is kept
+        # current below, so a fingerprint repeated within the batch sees the earlier write.
+        existing: Dict[str, Dict[str, Any]] = {}
+        if items:
+            fps = list(dict.fromkeys(it[0] for it in items))
+            q = ",".join(["?"] * len(fps))
+            cur = con.execute(
+                f"SELECT fingerprint, type, content, context, tags_json, importance FROM memory_items WHERE fingerprint IN ({q})",
+                tuple(fps),
+            )
+            existing = {str(r["fingerprint"]): dict(r) for r in cur}
 
+        for fp, mem_type, content, context, importance, tags, tags_json in items:
             # Insert or update.
             # If content/context/tags/type changes, embedding is marked dirty.
-            cur = con.execute("SELECT rowid, type, content, context, tags_json, importance FROM memory_items WHERE fingerprint = ?", (fp,))
-            row = cur.fetchone()
+            row = existing.get(fp)
             if row is None:
                 con.execute(
                     """
@@ -264,6 +323,14 @@ class MemoryDB:
                     """,
                     (fp, mem_type, content, context, importance, tags_json, now_ms, now_ms, run_id),
                 )
+                existing[fp] = {
+                    "fingerprint": fp,
+                    "type": mem_type,
+                    "content": content,
+                    "context": context,
+                    "tags_json": tags_json,
+                    "importance": importance,
+                }
                 touched += 1
                 added.append(
                     {
@@ -295,7 +362,7 @@ class MemoryDB:
                 except Exception:
                     new_tags = set()
                 merged_tags_json = json.dumps(sorted(old_tags | new_tags), ensure_ascii=False)
-                old_importance = int(row["importance"] or 0) if "importance" in row.keys() else 0
+                old_importance = int(row.get("importance") or 0)
                 new_importance = old_importance if old_importance > importance else importance
                 is_modified = (
                     existing_changed
@@ -322,6 +389,7 @@ class MemoryDB:
                     """,
                     (now_ms, importance, importance, merged_ctx, merged_tags_json, run_id, 1 if existing_changed else 0, fp),
                 )
+                existing[fp] = {**row, "context": merged_ctx, "tags_json": merged_tags_json, "importance": new_importance}
                 touched += 1
                 if is_modified:
                     modified.append(
@@ -349,10 +417,7 @@ class MemoryDB:
         )
         out: List[Dict[str, Any]] = []
         for r in cur.fetchall():
-            try:
-                tags = json.loads(r["tags_json"] or "[]")
-            except Exception:
-                tags = []
+            tags = _tags(r["tags_json"])
             out.append(
                 {
                     "rowid": int(r["rowid"]),
@@ -361,7 +426,7 @@ class MemoryDB:
                     "content": str(r["content"]),
                     "context": str(r["context"]),
                     "importance": int(r["importance"] or 0),
-                    "tags": list(tags or []),
+                    "tags": tags,
                     "first_seen_ms": int(r["first_seen_ms"] or 0),
                     "last_seen_ms": int(r["last_seen_ms"] or 0),
                     "count": int(r["count"] or 0),
@@ -374,7 +439,8 @@ class MemoryDB:
         Return list of (rowid, bm25_score) where lower bm25 is better.
         """
         q = (query or "").strip()
-        if not q:
+        match = _fts_match_query(q)
+        if not match:
             return []
         con = self._connect()
         try:
@@ -386,7 +452,7 @@ class MemoryDB:
                 ORDER BY score
                 LIMIT ?
                 """,
-                (q, int(limit)),
+                (match, int(limit)),
             )
             return [(int(r["rowid"]), float(r["score"])) for r in cur.fetchall()]
         except Exception:
@@ -439,7 +505,7 @@ class MemoryDB:
             if not blob:
                 continue
             vec = _unpack_f32(blob)
-            sim = _cosine(query_embedding, vec)
+            sim = cosine(query_embedding, vec)
             if sim > 0:
                 scored.append((sim, int(r["rowid"])))
         scored.sort(key=lambda x: x[0], reverse=True)
@@ -522,10 +588,35 @@ class MemoryDB:
         - BM25 candidates (lexical)
         - then rerank by importance + recency + optional vector similarity
         """
-        bm = self.search_bm25(query, limit=candidate_limit)
-        if not bm:
+        match = _fts_match_query((query or "").strip())
+        if not match:
             return []
-        return self.search_hybrid_from_bm25(bm=bm, limit=limit, query_embedding=query_embedding)
+        con = self._connect()
+        try:
+            # BM25 candidates and their scoring columns in one round trip.
+            cur = con.execute(
+                """
+                SELECT memory_fts.rowid AS rowid, bm25(memory_fts) AS score, m.importance, m.last_seen_ms, m.embedding
+                FROM memory_fts
+                JOIN memory_items m ON m.rowid = memory_fts.rowid
+                WHERE memory_fts MATCH ?
+                ORDER BY score
+                LIMIT ?
+                """,
+                (match, int(candidate_limit)),
+            )
+            rows = cur.fetchall()
+        except Exception:
+            bm = self.search_bm25(query, limit=candidate_limit)
+            if not bm:
+                return []
+            return self.search_hybrid_from_bm25(bm=bm, limit=limit, query_embedding=query_embedding)
+        return self._rank_bm25(
+            con,
+            [(int(r["rowid"]), float(r["score"]), r) for r in rows],
+            limit=limit,
+            query_embedding=query_embedding,
+        )
 
     def search_hybrid_union(
         self,
@@ -551,7 +642,7 @@ class MemoryDB:
         q = ",".join(["?"] * len(rowids))
         cur = con.execute(
             f"""
-            SELECT rowid, fingerprint, type, content, context, importance, tags_json, last_seen_ms, count, embedding
+            SELECT rowid, importance, last_seen_ms, embedding
             FROM memory_items
             WHERE rowid IN ({q})
             """,
@@ -580,36 +671,44 @@ class MemoryDB:
             if query_embedding is not None and vec_sim <= 0.0:
                 blob = r["embedding"]
                 if blob:
-                    vec_sim = _cosine(query_embedding, _unpack_f32(blob))
+                    vec_sim = cosine(query_embedding, _unpack_f32(blob))
 
             score = (lexical * 3.0) + (importance * 2.0) + recency + (vec_sim * 4.0)
             scored.append((score, rid))
 
         scored.sort(key=lambda x: x[0], reverse=True)
-        top = [rid for _, rid in scored[: int(limit)]]
+        return self._result_rows(con, [rid for _, rid in scored[: int(limit)]])
 
-        out: List[Dict[str, Any]] = []
-        for rid in top:
-            r = by_rowid.get(rid)
-            if not r:
-                continue
-            try:
-                tags = json.loads(r["tags_json"] or "[]")
-            except Exception:
-                tags = []
-            out.append(
-                {
-                    "id": str(r["fingerprint"]),
-                    "type": str(r["type"]),
-                    "content": str(r["content"]),
-                    "context": str(r["context"]),
-                    "importance": int(r["importance"] or 0),
-                    "tags": list(tags or []),
-                    "last_seen_ms": int(r["last_seen_ms"] or 0),
-                    "count": int(r["count"] or 0),
-                }
-            )
-        return out
+    def _result_rows(self, con: sqlite3.Connection, rowids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Result dicts for the given rowids, in that order. Candidates are scored on the narrow
+        importance/recency/embedding columns; content, context and tags are only read for the winners.
+        """
+        if not rowids:
+            return []
+        q = ",".join(["?"] * len(rowids))
+        cur = con.execute(
+            f"""
+            SELECT rowid, fingerprint, type, content, context, importance, tags_json, last_seen_ms, count
+            FROM memory_items
+            WHERE rowid IN ({q})
+            """,
+            tuple(rowids),
+        )
+        by_rowid = {
+            int(rowid): {
+                "id": str(fp),
+                "type": str(typ),
+                "content": str(content),
+                "context": str(context),
+                "importance": int(importance or 0),
+                "tags": _tags(tags_json),
+                "last_seen_ms": int(last_seen_ms or 0),
+                "count": int(count or 0),
+            }
+            for rowid, fp, typ, content, context, importance, tags_json, last_seen_ms, count in cur
+        }
+        return [by_rowid[rid] for rid in rowids if rid in by_rowid]
 
     def search_hybrid_from_bm25(
         self,
@@ -630,64 +729,40 @@ class MemoryDB:
         q = ",".join(["?"] * len(rowids))
         cur = con.execute(
             f"""
-            SELECT rowid, fingerprint, type, content, context, importance, tags_json, last_seen_ms, count, embedding
+            SELECT rowid, importance, last_seen_ms, embedding
             FROM memory_items
             WHERE rowid IN ({q})
             """,
             tuple(rowids),
         )
-        now_ms = int(time.time() * 1000)
         by_rowid: Dict[int, sqlite3.Row] = {int(r["rowid"]): r for r in cur.fetchall()}
+        candidates = [(rid, float(score), by_rowid[rid]) for rid, score in bm if rid in by_rowid]
+        return self._rank_bm25(con, candidates, limit=limit, query_embedding=query_embedding)
 
-        # Prepare vector candidates
-        vecs: Dict[int, List[float]] = {}
-        if query_embedding:
-            for rid in rowids:
-                r = by_rowid.get(rid)
-                if not r:
-                    continue
-                blob = r["embedding"]
-                if blob:
-                    vecs[rid] = _unpack_f32(blob)
-
+    def _rank_bm25(
+        self,
+        con: sqlite3.Connection,
+        candidates: List[Tuple[int, float, sqlite3.Row]],
+        *,
+        limit: int,
+        query_embedding: Optional[List[float]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Score (rowid, bm25, row) candidates, in BM25 order, by lexical rank + importance + recency +
+        optional vector similarity. Rows carry the importance, last_seen_ms and embedding columns.
+        """
+        now_ms = int(time.time() * 1000)
         scored: List[Tuple[float, int]] = []
-        bm_by = {rid: score for rid, score in bm}
-        for rid in rowids:
-            r = by_rowid.get(rid)
-            if not r:
-                continue
-            bm25 = float(bm_by.get(rid, 1.0))
+        for rid, bm25, r in candidates:
             lexical = max(0.0, 2.0 - min(2.0, abs(bm25)))  # invert-ish; smaller |bm25| -> bigger score
             importance = float(r["importance"] or 0)
             last_seen = float(r["last_seen_ms"] or 0)
             age_days = max(0.0, (now_ms - last_seen) / 86_400_000.0) if last_seen else 3650.0
             recency = max(0.0, 1.5 - min(1.5, age_days / 7.0))
-            vec_sim = _cosine(query_embedding, vecs.get(rid, [])) if query_embedding else 0.0
+            blob = r["embedding"] if query_embedding else None
+            vec_sim = cosine(query_embedding, _unpack_f32(blob)) if blob else 0.0
             score = (lexical * 3.0) + (importance * 2.0) + recency + (vec_sim * 4.0)
             scored.append((score, rid))
 
         scored.sort(key=lambda x: x[0], reverse=True)
-        top = [rid for _, rid in scored[: int(limit)]]
-
-        out: List[Dict[str, Any]] = []
-        for rid in top:
-            r = by_rowid.get(rid)
-            if not r:
-                continue
-            try:
-                tags = json.loads(r["tags_json"] or "[]")
-            except Exception:
-                tags = []
-            out.append(
-                {
-                    "id": str(r["fingerprint"]),
-                    "type": str(r["type"]),
-                    "content": str(r["content"]),
-                    "context": str(r["context"]),
-                    "importance": int(r["importance"] or 0),
-                    "tags": list(tags or []),
-                    "last_seen_ms": int(r["last_seen_ms"] or 0),
-                    "count": int(r["count"] or 0),
-                }
-            )
-        return out
+        return self._result_rows(con, [rid for _, rid in scored[: int(limit)]])
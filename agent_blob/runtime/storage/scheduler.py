@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 import re
 from zoneinfo import ZoneInfo
 
+from .codec import dumps, loads
 from .paths import data_dir
 from agent_blob import config
 
@@ -25,30 +26,60 @@ class SchedulerStore:
 
     def __init__(self):
         self._path = data_dir() / "schedules.json"
+        # File IO runs in a worker thread; serialize read-modify-write cycles across awaits.
+        self._lock = asyncio.Lock()
+        # Parsed schedules, reused until schedules.json changes on disk (pop_due runs every supervisor tick).
+        self._cache: Optional[list[dict]] = None
+        self._cache_mtime_ns: Optional[int] = None
 
     async def startup(self) -> None:
         self._path.parent.mkdir(parents=True, exist_ok=True)
         if not self._path.exists():
             self._path.write_text("[]", encoding="utf-8")
         # One-time migrate on startup so existing schedules get normalized.
-        items = self._load()
+        items = await asyncio.to_thread(self._load)
         migrated, changed = self._migrate(items)
         if changed:
-            self._save(migrated)
+            await asyncio.to_thread(self._save, migrated)
+        else:
+            self._remember(migrated)
 
     def _load(self) -> list[dict]:
         try:
-            return json.loads(self._path.read_text(encoding="utf-8"))
+            return loads(self._path.read_bytes())
         except Exception:
             return []
 
     def _save(self, items: list[dict]) -> None:
         tmp = self._path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(items, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        tmp.write_bytes(dumps(items, indent=True) + b"\n")
         tmp.replace(self._path)
+        self._remember(items)
+
+    def _mtime_ns(self) -> Optional[int]:
+        try:
+            return self._path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _remember(self, items: list[dict]) -> None:
+        self._cache = list(items)
+        self._cache_mtime_ns = self._mtime_ns()
+
+    async def _items(self) -> list[dict]:
+        """
+        Migrated schedules as a new list over the cached records. A stat() decides whether the
+        file was edited externally; only then is it re-read and re-parsed off the event loop.
+        The records are shared with the cache: replace a record with a copy before changing it, so
+        a failed save (or an aborted pop_due) leaves the cache matching disk.
+        """
+        if self._cache is None or self._mtime_ns() != self._cache_mtime_ns:
+            items, _ = self._migrate(await asyncio.to_thread(self._load))
+            self._remember(items)
+        return list(self._cache or [])
 
     async def list_schedules(self) -> list[dict]:
-        items, _ = self._migrate(self._load())
+        items = [dict(s) for s in await self._items()]
         items.sort(key=lambda x: float(x.get("next_run_at", 0)), reverse=False)
         return items
 
@@ -110,28 +141,29 @@ class SchedulerStore:
         enabled: bool = True,
         title: Optional[str] = None,
     ) -> dict:
-        items, _ = self._migrate(self._load())
-        now = time.time()
-        interval_s = max(1, int(interval_s))
-        sched_id = f"sched_{int(now*1000)}"
-        input_text = self._sanitize_input(str(input or ""))
-        rec = {
-            "id": sched_id,
-            "type": "interval",
-            "title": (title or input_text or "").strip()[:120],
-            "enabled": bool(enabled),
-            "created_at": now,
-            "updated_at": now,
-            "next_run_at": now + interval_s,
-            "last_run_at": None,
-            "last_run_id": None,
-            "schedule": {"interval_s": interval_s},
-            "payload": {"kind": "prompt", "text": input_text},
-            "tz": None,
-        }
-        items.append(rec)
-        self._save(items)
-        return rec
+        async with self._lock:
+            items = await self._items()
+            now = time.time()
+            interval_s = max(1, int(interval_s))
+            sched_id = f"sched_{int(now*1000)}"
+            input_text = self._sanitize_input(str(input or ""))
+            rec = {
+                "id": sched_id,
+                "type": "interval",
+                "title": (title or input_text or "").strip()[:120],
+                "enabled": bool(enabled),
+                "created_at": now,
+                "updated_at": now,
+                "next_run_at": now + interval_s,
+                "last_run_at": None,
+                "last_run_id": None,
+                "schedule": {"interval_s": interval_s},
+                "payload": {"kind": "prompt", "text": input_text},
+                "tz": None,
+            }
+            items.append(rec)
+            await asyncio.to_thread(self._save, items)
+            return rec
 
     def _sanitize_input(self, text: str) -> str:
         """
@@ -213,6 +245,9 @@ class SchedulerStore:
             return False
         if spec.get("hour") is not None and dt.hour not in spec["hour"]:
             return False
+        return self._cron_day_matches(dt, spec)
+
+    def _cron_day_matches(self, dt: datetime, spec: dict) -> bool:
         if spec.get("dom") is not None and dt.day not in spec["dom"]:
             return False
         if spec.get("mon") is not None and dt.month not in spec["mon"]:
@@ -232,7 +267,16 @@ class SchedulerStore:
         cur = base.replace(second=0, microsecond=0) + timedelta(minutes=1)
         # Bound search to avoid infinite loops with unsupported expressions.
         limit = cur + timedelta(days=370)
+        hours = spec.get("hour")
         while cur <= limit:
+            # Skip whole non-matching days and hours instead of stepping minute by minute
+            # (a yearly cron would otherwise walk ~500k candidates per pop_due).
+            if not self._cron_day_matches(cur, spec):
+                cur = (cur + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if hours is not None and cur.hour not in hours:
+                cur = (cur + timedelta(hours=1)).replace(minute=0)
+                continue
             if self._cron_matches(cur, spec):
                 return cur.timestamp()
             cur = cur + timedelta(minutes=1)
@@ -247,28 +291,29 @@ class SchedulerStore:
         enabled: bool = True,
         title: Optional[str] = None,
     ) -> dict:
-        items, _ = self._migrate(self._load())
-        now = time.time()
-        sched_id = f"sched_{int(now*1000)}"
-        next_run_at = self._next_cron_run_at(expr=cron, tz_name=tz, now=now)
-        input_text = self._sanitize_input(str(input or ""))
-        rec = {
-            "id": sched_id,
-            "type": "cron",
-            "title": (title or input_text or "").strip()[:120],
-            "enabled": bool(enabled),
-            "created_at": now,
-            "updated_at": now,
-            "next_run_at": next_run_at,
-            "last_run_at": None,
-            "last_run_id": None,
-            "schedule": {"cron": str(cron or "").strip()},
-            "payload": {"kind": "prompt", "text": input_text},
-            "tz": str(tz).strip() if tz else None,
-        }
-        items.append(rec)
-        self._save(items)
-        return rec
+        async with self._lock:
+            items = await self._items()
+            now = time.time()
+            sched_id = f"sched_{int(now*1000)}"
+            next_run_at = self._next_cron_run_at(expr=cron, tz_name=tz, now=now)
+            input_text = self._sanitize_input(str(input or ""))
+            rec = {
+                "id": sched_id,
+                "type": "cron",
+                "title": (title or input_text or "").strip()[:120],
+                "enabled": bool(enabled),
+                "created_at": now,
+                "updated_at": now,
+                "next_run_at": next_run_at,
+                "last_run_at": None,
+                "last_run_id": None,
+                "schedule": {"cron": str(cron or "").strip()},
+                "payload": {"kind": "prompt", "text": input_text},
+                "tz": str(tz).strip() if tz else None,
+            }
+            items.append(rec)
+            await asyncio.to_thread(self._save, items)
+            return rec
 
     async def create_daily(
         self,
@@ -289,87 +334,94 @@ class SchedulerStore:
 
     async def delete(self, *, schedule_id: str) -> dict:
         sid = str(schedule_id or "").strip()
-        items, _ = self._migrate(self._load())
-        before = len(items)
-        items = [s for s in items if str(s.get("id", "")) != sid]
-        removed = before - len(items)
-        if removed:
-            self._save(items)
-        return {"ok": bool(removed), "removed": removed, "id": sid}
+        async with self._lock:
+            items = await self._items()
+            before = len(items)
+            items = [s for s in items if str(s.get("id", "")) != sid]
+            removed = before - len(items)
+            if removed:
+                await asyncio.to_thread(self._save, items)
+            return {"ok": bool(removed), "removed": removed, "id": sid}
 
     async def set_enabled(self, *, schedule_id: str, enabled: bool) -> dict:
         sid = str(schedule_id or "").strip()
         if not sid:
             return {"ok": False, "error": "Missing schedule id"}
-        items, _ = self._migrate(self._load())
-        changed = False
-        for s in items:
-            if not isinstance(s, dict):
-                continue
-            if str(s.get("id", "")) != sid:
-                continue
-            s["enabled"] = bool(enabled)
-            s["updated_at"] = time.time()
-            changed = True
-            break
-        if changed:
-            self._save(items)
-            return {"ok": True, "id": sid, "enabled": bool(enabled)}
-        return {"ok": False, "error": "Schedule not found", "id": sid}
+        async with self._lock:
+            items = await self._items()
+            changed = False
+            for i, s in enumerate(items):
+                if not isinstance(s, dict):
+                    continue
+                if str(s.get("id", "")) != sid:
+                    continue
+                s = items[i] = dict(s)
+                s["enabled"] = bool(enabled)
+                s["updated_at"] = time.time()
+                changed = True
+                break
+            if changed:
+                await asyncio.to_thread(self._save, items)
+                return {"ok": True, "id": sid, "enabled": bool(enabled)}
+            return {"ok": False, "error": "Schedule not found", "id": sid}
 
     async def pop_due(self, *, now: Optional[float] = None) -> list[dict]:
         """
         Return schedules due to run, and advance their next_run_at.
         """
-        items, _ = self._migrate(self._load())
-        t = float(now if now is not None else time.time())
-        due: list[dict] = []
-        changed = False
-        for s in items:
-            if not isinstance(s, dict):
-                continue
-            if not bool(s.get("enabled", True)):
-                continue
-            next_run = float(s.get("next_run_at", 0) or 0)
-            if next_run <= t:
-                due.append(dict(s))
-                s["last_run_at"] = t
-                stype = str(s.get("type", "") or "")
-                sched = s.get("schedule") if isinstance(s.get("schedule"), dict) else {}
-                if stype == "interval":
-                    interval_s = max(1, int((sched or {}).get("interval_s", 60) or 60))
-                    s["next_run_at"] = t + interval_s
-                elif stype == "cron":
-                    expr = str((sched or {}).get("cron", "") or "")
-                    tz_name = s.get("tz")
-                    s["next_run_at"] = self._next_cron_run_at(expr=expr, tz_name=str(tz_name) if tz_name else None, now=t)
-                else:
-                    # Unknown type; disable it so it doesn't spin.
-                    s["enabled"] = False
-                    s["next_run_at"] = t + 365 * 86400
-                s["updated_at"] = t
-                changed = True
-        if changed:
-            self._save(items)
-        due.sort(key=lambda x: float(x.get("next_run_at", 0)), reverse=False)
-        return due
+        async with self._lock:
+            items = await self._items()
+            t = float(now if now is not None else time.time())
+            due: list[dict] = []
+            changed = False
+            for i, s in enumerate(items):
+                if not isinstance(s, dict):
+                    continue
+                if not bool(s.get("enabled", True)):
+                    continue
+                next_run = float(s.get("next_run_at", 0) or 0)
+                if next_run <= t:
+                    due.append(dict(s))
+                    s = items[i] = dict(s)
+                    s["last_run_at"] = t
+                    stype = str(s.get("type", "") or "")
+                    sched = s.get("schedule") if isinstance(s.get("schedule"), dict) else {}
+                    if stype == "interval":
+                        interval_s = max(1, int((sched or {}).get("interval_s", 60) or 60))
+                        s["next_run_at"] = t + interval_s
+                    elif stype == "cron":
+                        expr = str((sched or {}).get("cron", "") or "")
+                        tz_name = s.get("tz")
+                        s["next_run_at"] = self._next_cron_run_at(expr=expr, tz_name=str(tz_name) if tz_name else None, now=t)
+                    else:
+                        # Unknown type; disable it so it doesn't spin.
+                        s["enabled"] = False
+                        s["next_run_at"] = t + 365 * 86400
+                    s["updated_at"] = t
+                    changed = True
+            if changed:
+                await asyncio.to_thread(self._save, items)
+            due.sort(key=lambda x: float(x.get("next_run_at", 0)), reverse=False)
+            return due
 
     async def set_last_run_id(self, *, schedule_id: str, run_id: str) -> bool:
         sid = str(schedule_id or "").strip()
         rid = str(run_id or "").strip()
         if not sid or not rid:
             return False
-        items, _ = self._migrate(self._load())
-        changed = False
-        for s in items:
-            if not isinstance(s, dict):
-                continue
-            if str(s.get("id", "")) != sid:
-                continue
-            s["last_run_id"] = rid
-            s["updated_at"] = time.time()
-            changed = True
-            break
-        if changed:
-            self._save(items)
-        return changed
+        async with self._lock:
+            items = await self._items()
+            changed = False
+            for i, s in enumerate(items):
+                if not isinstance(s, dict):
+                    continue
+                if str(s.get("id", "")) != sid:
+                    continue
+                s = items[i] = dict(s)
+                s["last_run_id"] = rid
+                s["updated_at"] = time.time()
+                changed = True
+                break
+            if changed:
+                await asyncio.to_thread(self._save, items)
+            return changed
@@ -1,26 +1,48 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .codec import dumps, dumps_line, loads
 from .paths import data_dir
 from .jsonl_archive import rotate_jsonl, prune_archives
 from agent_blob import config
 
 
+logger = logging.getLogger("agent_blob.tasks")
+
+# Rewrite the tasks.json snapshot after this many appended deltas.
+CHECKPOINT_EVERY = 10
+# Task statuses that count as finished.
+TERMINAL_STATUSES = frozenset({"done", "cancelled", "failed"})
+# Non-terminal statuses that keep a task active regardless of how long ago it was updated.
+ALWAYS_ACTIVE_STATUSES = frozenset({"running", "waiting_permission", "waiting_user"})
+# Coalesce task changes and history events for this long before writing them.
+FLUSH_INTERVAL_S = 0.1
+
+
 class TaskStore:
     """
     Durable task ledger.
-    MVP: tasks.json is the current state; tasks_events.jsonl is append-only history.
+    tasks.json is a snapshot of the current state; tasks.deltas.jsonl holds per-task upserts/deletes
+    applied since that snapshot; tasks_events.jsonl is append-only history.
     """
 
     def __init__(self):
         d = data_dir()
         self._tasks = d / "tasks.json"
+        self._deltas = d / "tasks.deltas.jsonl"
         self._events = d / "tasks_events.jsonl"
+        self._data: Optional[dict] = None
+        self._pending_deltas = 0
+        self._dirty: Dict[str, None] = {}  # insertion-ordered set of task ids awaiting a delta
+        self._event_buf: List[bytes] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._io_lock = asyncio.Lock()
 
     async def startup(self) -> None:
         self._tasks.parent.mkdir(parents=True, exist_ok=True)
@@ -29,14 +51,127 @@ class TaskStore:
         if not self._events.exists():
             self._events.write_text("", encoding="utf-8")
 
-    def _load(self) -> dict:
+    async def _state(self) -> dict:
+        """
+        Current state (snapshot + replayed deltas), loaded once and kept in memory.
+        """
+        if self._data is None:
+            data, pending = await asyncio.to_thread(self._read_state_sync)
+            if self._data is None:
+                self._data = data
+                self._pending_deltas = pending
+        return self._data
+
+    def _read_state_sync(self) -> Tuple[dict, int]:
         try:
-            return json.loads(self._tasks.read_text(encoding="utf-8"))
+            data = loads(self._tasks.read_bytes())
         except Exception:
-            return {}
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        pending = 0
+        try:
+            f = self._deltas.open("rb")
+        except FileNotFoundError:
+            return data, pending
+        with f:
+            for raw in f:
+                try:
+                    d = loads(raw)
+                except Exception:
+                    continue
+                tid = d.get("id")
+                if not isinstance(tid, str):
+                    continue
+                if d.get("op") == "del":
+                    data.pop(tid, None)
+                elif isinstance(d.get("task"), dict):
+                    data[tid] = d["task"]
+                pending += 1
+        return data, pending
+
+    async def _put(self, task_id: str, task: dict) -> None:
+        """
+        Record a single-task change. Persistence is write-behind: the task is marked dirty and the
+        flusher appends one delta per dirty task, so a burst of updates to the same task costs one line.
+        """
+        data = await self._state()
+        data[task_id] = task
+        self._dirty[task_id] = None
+        self._schedule_flush()
 
-    def _save(self, data: dict) -> None:
-        self._tasks.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    async def _delete(self, task_id: str) -> None:
+        """
+        Drop a task; the flusher records it as a "del" delta (a dirty id no longer in the state).
+        """
+        data = await self._state()
+        if data.pop(task_id, None) is not None:
+            self._dirty[task_id] = None
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(FLUSH_INTERVAL_S)
+        # Changes made while a flush is awaiting its write see this task still running and don't
+        # schedule another one, so keep flushing until nothing is pending.
+        while self._dirty or self._event_buf:
+            try:
+                await self.flush()
+            except Exception:
+                # Pending changes were put back; the next mutation (or shutdown) retries them.
+                logger.exception("task store flush failed")
+                return
+
+    async def flush(self) -> None:
+        """
+        Persist pending task changes and history events now (also used on shutdown).
+        Buffers are only dropped once their write succeeds; on failure they are restored and the
+        error is raised.
+        """
+        async with self._io_lock:
+            # Build payloads on the loop (consistent with in-memory state), write them off-loop.
+            if self._event_buf:
+                pending_events = list(self._event_buf)
+                self._event_buf.clear()
+                try:
+                    await asyncio.to_thread(_append_line, self._events, b"".join(pending_events))
+                except BaseException:
+                    self._event_buf[:0] = pending_events
+                    raise
+            data = self._data
+            if data is None:
+                return
+            if self._dirty:
+                dirty = list(self._dirty)
+                lines = [
+                    dumps_line({"op": "put", "id": tid, "task": data[tid]} if tid in data else {"op": "del", "id": tid})
+                    for tid in dirty
+                ]
+                self._dirty.clear()
+                try:
+                    await asyncio.to_thread(_append_line, self._deltas, b"".join(lines))
+                except BaseException:
+                    # Re-mark the ids; any that were touched again meanwhile are already dirty.
+                    for tid in dirty:
+                        self._dirty[tid] = None
+                    raise
+                self._pending_deltas += len(lines)
+            if self._pending_deltas >= CHECKPOINT_EVERY:
+                payload = dumps(data)
+                await asyncio.to_thread(self._write_snapshot_sync, payload)
+                self._pending_deltas = 0
+
+    def _write_snapshot_sync(self, payload: bytes) -> None:
+        tmp = self._tasks.with_suffix(".json.tmp")
+        tmp.write_bytes(payload)
+        tmp.replace(self._tasks)
+        try:
+            self._deltas.unlink()
+        except FileNotFoundError:
+            pass
 
     async def ensure_task(self, *, task_id: str, title: str) -> str:
         """
@@ -46,47 +181,49 @@ class TaskStore:
         tid = str(task_id or "").strip()
         if not tid:
             raise ValueError("Missing task_id")
-        data = self._load()
+        data = await self._state()
         now = time.time()
         if tid not in data or not isinstance(data.get(tid), dict):
-            data[tid] = {
-                "id": tid,
-                "status": "open",
-                "title": (title or "").strip()[:120],
-                "created_at": now,
-                "updated_at": now,
-                "run_ids": [],
-            }
-            self._append_event({"type": "task.created", "taskId": tid, "runId": None, "system": True})
+            await self._put(
+                tid,
+                {
+                    "id": tid,
+                    "status": "open",
+                    "title": (title or "").strip()[:120],
+                    "created_at": now,
+                    "updated_at": now,
+                    "run_ids": [],
+                },
+            )
+            await self._append_event({"type": "task.created", "taskId": tid, "runId": None, "system": True})
         else:
             # Update title if it's empty and we have a better one.
             t = data[tid]
-            if isinstance(t, dict):
-                if not str(t.get("title") or "").strip() and (title or "").strip():
-                    t["title"] = (title or "").strip()[:120]
-                    t["updated_at"] = now
-                    data[tid] = t
-        self._save(data)
+            if not str(t.get("title") or "").strip() and (title or "").strip():
+                t["title"] = (title or "").strip()[:120]
+                t["updated_at"] = now
+                await self._put(tid, t)
         return tid
 
     async def create_task(self, *, run_id: str, title: str) -> str:
-        data = self._load()
         task_id = f"task_{int(time.time()*1000)}"
         now = time.time()
-        data[task_id] = {
-            "id": task_id,
-            "status": "open",
-            "title": (title or "").strip()[:120],
-            "created_at": now,
-            "updated_at": now,
-            "run_ids": [run_id],
-        }
-        self._save(data)
-        self._append_event({"type": "task.created", "taskId": task_id, "runId": run_id})
+        await self._put(
+            task_id,
+            {
+                "id": task_id,
+                "status": "open",
+                "title": (title or "").strip()[:120],
+                "created_at": now,
+                "updated_at": now,
+                "run_ids": [run_id],
+            },
+        )
+        await self._append_event({"type": "task.created", "taskId": task_id, "runId": run_id})
         return task_id
 
     async def attach_run(self, *, task_id: str, run_id: str) -> bool:
-        data = self._load()
+        data = await self._state()
         task = data.get(task_id)
         if not isinstance(task, dict):
             return False
@@ -95,27 +232,22 @@ class TaskStore:
             run_ids.append(run_id)
         task["run_ids"] = run_ids
         task["updated_at"] = time.time()
-        self._save(data)
-        self._append_event({"type": "task.attached", "taskId": task_id, "runId": run_id})
+        await self._put(task_id, task)
+        await self._append_event({"type": "task.attached", "taskId": task_id, "runId": run_id})
         return True
 
     async def set_status(self, *, task_id: str, status: str) -> None:
-        data = self._load()
+        data = await self._state()
         task = data.get(task_id)
         if not task:
             return
         task["status"] = status
         task["updated_at"] = time.time()
-        self._save(data)
-        self._append_event({"type": "task.status", "taskId": task_id, "status": status})
+        await self._put(task_id, task)
+        await self._append_event({"type": "task.status", "taskId": task_id, "status": status})
 
     async def most_recent_active(self) -> Optional[dict]:
-        tasks = await self.list_tasks()
-        for t in tasks:
-            status = str(t.get("status", "") or "")
-            if status not in ("done", "cancelled", "failed"):
-                return t
-        return None
+        return await self._latest(lambda status: status not in TERMINAL_STATUSES)
 
     async def most_recent_within(self, *, window_s: int, include_terminal: bool = False) -> Optional[dict]:
         """
@@ -127,16 +259,26 @@ class TaskStore:
         if window_s <= 0:
             return None
         now = time.time()
-        tasks = await self.list_tasks()
-        for t in tasks:
-            status = str(t.get("status", "") or "")
-            if (not include_terminal) and status in ("done", "cancelled", "failed"):
-                continue
-            updated = float(t.get("updated_at", 0) or 0)
-            if now - updated <= window_s:
-                return t
+        t = await self._latest(lambda status: include_terminal or status not in TERMINAL_STATUSES)
+        if t is not None and now - float(t.get("updated_at", 0) or 0) <= window_s:
+            return t
         return None
 
+    async def _latest(self, keep: Callable[[str], bool]) -> Optional[dict]:
+        """
+        Most recently updated task whose status passes `keep`, found in one pass over the in-memory
+        state (no copy + sort of the whole ledger). Returns a copy, like list_tasks().
+        """
+        best: Optional[dict] = None
+        best_ts = 0.0
+        for t in (await self._state()).values():
+            if not isinstance(t, dict) or not keep(str(t.get("status", "") or "")):
+                continue
+            ts = float(t.get("updated_at", 0) or 0)
+            if best is None or ts > best_ts:
+                best, best_ts = t, ts
+        return dict(best) if best is not None else None
+
     async def auto_close_inactive(self, *, older_than_s: int) -> Dict[str, int]:
         """
         Convert stale non-terminal tasks to done if they haven't been updated recently.
@@ -148,32 +290,45 @@ class TaskStore:
         if older_than_s <= 0:
             return {"closed": 0, "total": 0}
 
-        data = self._load()
+        data = await self._state()
         now = time.time()
-        terminal_statuses = {"done", "cancelled", "failed"}
         closed = 0
 
         for tid, t in list(data.items()):
             if not isinstance(t, dict):
                 continue
             status = str(t.get("status", "") or "")
-            if status in terminal_statuses:
+            if status in TERMINAL_STATUSES:
                 continue
             updated = float(t.get("updated_at", 0) or 0)
             if (now - updated) >= older_than_s:
                 t["status"] = "done"
                 t["updated_at"] = now
-                data[tid] = t
+                await self._put(tid, t)
                 closed += 1
-                self._append_event({"type": "task.autoclosed", "taskId": tid})
+                await self._append_event({"type": "task.autoclosed", "taskId": tid})
 
-        if closed:
-            self._save(data)
         return {"closed": closed, "total": len(data)}
 
+    async def list_active(self, *, window_s: float) -> list[dict]:
+        """
+        Non-terminal tasks that are either blocked/running or were updated within window_s, newest
+        first. Filters the in-memory state before copying, so terminal history is never materialized.
+        """
+        now = time.time()
+        tasks = [
+            dict(t)
+            for t in (await self._state()).values()
+            if isinstance(t, dict)
+            and (status := str(t.get("status", "") or "")) not in TERMINAL_STATUSES
+            and (status in ALWAYS_ACTIVE_STATUSES or (now - float(t.get("updated_at", 0) or 0)) <= window_s)
+        ]
+        tasks.sort(key=lambda t: float(t.get("updated_at", 0)), reverse=True)
+        return tasks
+
     async def list_tasks(self) -> list[dict]:
-        data = self._load()
-        tasks = list(data.values())
+        data = await self._state()
+        tasks = [dict(t) for t in data.values() if isinstance(t, dict)]
         tasks.sort(key=lambda t: float(t.get("updated_at", 0)), reverse=True)
         return tasks
 
@@ -186,18 +341,17 @@ class TaskStore:
 
         Returns {removed:int, kept:int}.
         """
-        data = self._load()
+        data = await self._state()
         now = time.time()
         cutoff = now - (keep_days * 86400)
 
-        terminal_statuses = {"done", "cancelled", "failed"}
         terminal = []
         active = {}
 
         for tid, t in list(data.items()):
             status = str(t.get("status", "") or "")
             updated = float(t.get("updated_at", 0) or 0)
-            if status in terminal_statuses:
+            if status in TERMINAL_STATUSES:
                 terminal.append((updated, tid, t))
             else:
                 active[tid] = t
@@ -207,16 +361,18 @@ class TaskStore:
         terminal_kept.sort(key=lambda x: x[0], reverse=True)
         terminal_kept = terminal_kept[: max(0, int(keep_max))]
 
-        new_data = dict(active)
-        for _, tid, t in terminal_kept:
-            new_data[tid] = t
+        kept_ids = set(active)
+        kept_ids.update(tid for _, tid, _ in terminal_kept)
 
-        removed = len(data) - len(new_data)
+        removed = 0
+        for _, tid, _ in terminal:
+            if tid not in kept_ids:
+                await self._delete(tid)
+                removed += 1
         if removed > 0:
-            self._save(new_data)
-            self._append_event({"type": "tasks.purged", "removed": removed, "kept": len(new_data)})
+            await self._append_event({"type": "tasks.purged", "removed": removed, "kept": len(data)})
 
-        return {"removed": removed, "kept": len(new_data)}
+        return {"removed": removed, "kept": len(data)}
 
     async def rotate_and_prune_events(self) -> Dict[str, Any]:
         d = self._tasks.parent
@@ -234,6 +390,11 @@ class TaskStore:
         )
         return {"rotated": bool(rec), "pruned": pruned}
 
-    def _append_event(self, ev: dict) -> None:
-        with self._events.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+    async def _append_event(self, ev: dict) -> None:
+        self._event_buf.append(dumps_line(ev))
+        self._schedule_flush()
+
+
+def _append_line(path: Path, line: bytes) -> None:
+    with path.open("ab") as f:
+        f.write(line)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -8,6 +9,12 @@ from agent_blob import config
 
 def _allowed_root() -> Path:
     root = config.allowed_fs_root() or os.getcwd()
+    return _resolved_root(root)
+
+
+@lru_cache(maxsize=16)
+def _resolved_root(root: str) -> Path:
+    # Keyed by the configured root (or cwd) string, so the realpath walk runs once per distinct root.
     return Path(root).resolve()
 
 
@@ -17,6 +24,19 @@ def _resolve(path: str) -> Path:
         p = (Path.cwd() / p)
     return p.resolve()
 
+
+def _missing_final_newline(p: Path) -> bool:
+    """
+    True if p is a non-empty file whose last byte isn't a newline (reads one byte, not the file).
+    """
+    try:
+        with p.open("rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except OSError:
+        return False
+
+
 def _within_root(p: Path, root: Path) -> bool:
     try:
         p.relative_to(root)
@@ -35,12 +55,8 @@ async def filesystem_write(path: str, content: str, *, append: bool = False, cre
         if append:
             # UX nicety: if appending to a non-empty text file, ensure we start on a new line
             # unless the caller already provided a leading newline.
-            try:
-                existing = p.read_text(encoding="utf-8") if p.exists() else ""
-            except Exception:
-                existing = ""
             to_write = str(content)
-            if existing and (not existing.endswith("\n")) and to_write and (not to_write.startswith("\n")):
+            if to_write and (not to_write.startswith("\n")) and _missing_final_newline(p):
                 to_write = "\n" + to_write
             with p.open("a", encoding="utf-8") as f:
                 f.write(to_write)
@@ -63,9 +79,9 @@ async def filesystem_read_optional(path: str) -> dict:
     if not _within_root(p, root):
         return {"ok": False, "error": f"Access denied (outside tools.allowed_fs_root): {p}", "path": str(p)}
     try:
-        if not p.exists():
-            return {"ok": True, "path": str(p), "content": "", "exists": False}
         return {"ok": True, "path": str(p), "content": p.read_text(encoding="utf-8"), "exists": True}
+    except FileNotFoundError:
+        return {"ok": True, "path": str(p), "content": "", "exists": False}
     except Exception as e:
         return {"ok": False, "error": str(e), "path": str(p)}
 
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
 
 
-ToolExecutor = Callable[[Dict[str, Any]], Awaitable[Any]]
+# Executors may be coroutines or plain functions; trivial in-memory tools don't need a coroutine frame.
+ToolExecutor = Callable[[Dict[str, Any]], Union[Any, Awaitable[Any]]]
+
+
+def object_schema(properties: Dict[str, Any], required: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    JSON schema for a tool's arguments object. Providers build these once at import time and share them.
+    """
+    schema: Dict[str, Any] = {"type": "object", "properties": properties}
+    if required:
+        schema["required"] = list(required)
+    return schema
+
+
+# Arguments schema for tools that take none.
+NO_ARGS_SCHEMA = object_schema({})
 
 
 @dataclass(frozen=True)
@@ -12,6 +27,7 @@ class ToolDefinition:
     """
     name: OpenAI function name (must be simple, no dots)
     capability: policy capability string (e.g. "shell.run")
+    parallel_safe: read-only tool that may run concurrently with other parallel-safe calls in the same round
     """
 
     name: str
@@ -19,6 +35,7 @@ class ToolDefinition:
     description: str
     parameters: Dict[str, Any]  # JSON schema
     executor: ToolExecutor
+    parallel_safe: bool = False
 
     def to_openai_tool(self) -> Dict[str, Any]:
         return {
@@ -34,9 +51,19 @@ class ToolDefinition:
 class ToolRegistry:
     def __init__(self, tools: List[ToolDefinition]):
         self._tools = {t.name: t for t in tools}
+        self._openai_tools: Optional[List[Dict[str, Any]]] = None
 
     def to_openai_tools(self) -> List[Dict[str, Any]]:
-        return [t.to_openai_tool() for t in self._tools.values()]
+        # Tool schemas don't change after construction; build the OpenAI payload once.
+        if self._openai_tools is None:
+            self._openai_tools = [t.to_openai_tool() for t in self._tools.values()]
+        return self._openai_tools
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached OpenAI tool payload (call after mutating the registered tools).
+        """
+        self._openai_tools = None
 
     def get(self, name: str) -> ToolDefinition:
         if name not in self._tools:
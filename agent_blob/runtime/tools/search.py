@@ -60,7 +60,8 @@ async def fs_grep(*, query: str, base_dir: str = ".", limit: int = 50, max_file_
     q = str(query or "").strip()
     if not q:
         return {"ok": False, "error": "query is required"}
-    ql = q.lower()
+    # Compile the case-insensitive matcher once instead of lowercasing every scanned line.
+    match = re.compile(re.escape(q), re.IGNORECASE).search
 
     limit = max(1, int(limit or 50))
     results: List[Dict[str, Any]] = []
@@ -77,16 +78,15 @@ async def fs_grep(*, query: str, base_dir: str = ".", limit: int = 50, max_file_
                 st = p.stat()
                 if st.st_size > int(max_file_bytes):
                     continue
-                text = p.read_text(encoding="utf-8", errors="replace")
+                # Stream lines instead of materializing the whole file plus a list of its lines.
+                with p.open("r", encoding="utf-8", errors="replace") as f:
+                    for i, line in enumerate(f, start=1):
+                        if match(line):
+                            results.append({"path": str(p), "line": i, "text": line.strip()[:400]})
+                            if len(results) >= limit:
+                                return {"ok": True, "query": q, "results": results, "truncated": True}
             except Exception:
                 continue
 
-            lines = text.splitlines()
-            for i, line in enumerate(lines, start=1):
-                if ql in line.lower():
-                    results.append({"path": str(p), "line": i, "text": line.strip()[:400]})
-                    if len(results) >= limit:
-                        return {"ok": True, "query": q, "results": results, "truncated": True}
-
     return {"ok": True, "query": q, "results": results, "truncated": False}
 
@@ -6,7 +6,7 @@ from agent_blob.runtime.skills.loader import SkillsLoader
 
 
 def build_skills_tools(loader: SkillsLoader):
-    async def skills_list(args: Dict[str, Any]) -> Any:
+    def skills_list(args: Dict[str, Any]) -> Any:
         out = loader.list()
         # Include enabled names for UX.
         try:
@@ -17,7 +17,7 @@ def build_skills_tools(loader: SkillsLoader):
             enabled = []
         return {"ok": True, "enabled": list(enabled or []), "skills": out}
 
-    async def skills_get(args: Dict[str, Any]) -> Any:
+    def skills_get(args: Dict[str, Any]) -> Any:
         name = str(args.get("name", "") or "").strip()
         s = loader.get(name)
         if not s:
@@ -22,22 +22,33 @@ async def web_fetch(url: str, *, max_bytes: int = 1_000_000, timeout_s: float =
 
     try:
         async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, headers=headers) as client:
-            r = await client.get(u)
-            content = r.content[:max_bytes]
-            ctype = r.headers.get("content-type", "")
-            text = ""
-            if "text" in ctype or "json" in ctype or "xml" in ctype or ctype == "":
-                text = content.decode(r.encoding or "utf-8", errors="replace")
-            else:
-                text = f"[non-text content-type: {ctype}] (bytes={len(content)})"
-            return {
-                "ok": True,
-                "url": u,
-                "status_code": int(r.status_code),
-                "content_type": ctype,
-                "text": text,
-                "truncated": len(r.content) > len(content),
-            }
+            # Stream the body and stop once max_bytes are in hand instead of downloading the
+            # whole response only to slice it.
+            async with client.stream("GET", u) as r:
+                chunks = []
+                size = 0
+                truncated = False
+                async for chunk in r.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > max_bytes:
+                        truncated = True
+                        break
+                content = b"".join(chunks)[:max_bytes]
+                ctype = r.headers.get("content-type", "")
+                text = ""
+                if "text" in ctype or "json" in ctype or "xml" in ctype or ctype == "":
+                    text = content.decode(r.encoding or "utf-8", errors="replace")
+                else:
+                    text = f"[non-text content-type: {ctype}] (bytes={len(content)})"
+                return {
+                    "ok": True,
+                    "url": u,
+                    "status_code": int(r.status_code),
+                    "content_type": ctype,
+                    "text": text,
+                    "truncated": truncated,
+                }
     except Exception as e:
         return {"ok": False, "error": str(e), "url": u}
 
@@ -1,17 +1,13 @@
 #!/usr/bin/env python3
-import asyncio
 import sys
 from pathlib import Path
 
-# Ensure repo root is on sys.path when running as a script.
+# Ensure repo root is on sys.path when running as a script (not needed once installed as `agent-blob`).
 root_dir = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(root_dir))
 
-from agent_blob.frontends.native.cli import main
+from agent_blob.frontends.native.cli import main_sync
 
 
 if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        pass
+    main_sync()
@@ -20,12 +20,18 @@ Configure Agent Blob:
 from __future__ import annotations
 
 import argparse
+import json
 import time
 import uuid
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+
+try:  # optional: C-accelerated JSON for request/response bodies
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 
 def _rpc_result(req_id: str, result: Any) -> Dict[str, Any]:
@@ -36,9 +42,138 @@ def _rpc_error(req_id: str, code: int, message: str) -> Dict[str, Any]:
     return {"jsonrpc": "2.0", "id": req_id, "error": {"code": int(code), "message": str(message)}}
 
 
+def _loads(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _response(content: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Response:
+    if orjson is None:
+        return JSONResponse(content, headers=headers)
+    return Response(orjson.dumps(content), media_type="application/json", headers=headers)
+
+
+# Static list payloads, built once at import rather than per request.
+_TOOLS_LIST_RESULT: Dict[str, Any] = {
+    "tools": [
+        {
+            "name": "example.echo",
+            "description": "Echo back the provided text.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"text": {"type": "string"}},
+                "required": ["text"],
+            },
+        },
+        {
+            "name": "example.add",
+            "description": "Add two numbers.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
+                "required": ["a", "b"],
+            },
+        },
+        {
+            "name": "example.time",
+            "description": "Return server time (unix seconds).",
+            "inputSchema": {"type": "object", "properties": {}},
+        },
+    ]
+}
+
+_PROMPTS_LIST_RESULT: Dict[str, Any] = {
+    "prompts": [
+        {
+            "name": "example.greeting",
+            "description": "A simple greeting prompt template.",
+            "arguments": [{"name": "name", "description": "Name to greet", "required": False}],
+        }
+    ]
+}
+
+
+def _text_content(text: str) -> Dict[str, Any]:
+    return {"content": [{"type": "text", "text": text}]}
+
+
+def _tool_echo(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return _text_content(str(arguments.get("text") or ""))
+
+
+def _tool_add(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    # float() errors surface as -32602 Invalid params.
+    return _text_content(str(float(arguments.get("a")) + float(arguments.get("b"))))
+
+
+def _tool_time(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return _text_content(str(int(time.time())))
+
+
+_TOOLS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "example.echo": _tool_echo,
+    "example.add": _tool_add,
+    "example.time": _tool_time,
+}
+
+
+def _arguments(params: Dict[str, Any]) -> Dict[str, Any]:
+    arguments = params.get("arguments") or {}
+    return arguments if isinstance(arguments, dict) else {}
+
+
+def _tools_list(req_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _rpc_result(req_id, _TOOLS_LIST_RESULT)
+
+
+def _tools_call(req_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    name = str(params.get("name") or "")
+    tool = _TOOLS.get(name)
+    if tool is None:
+        return _rpc_error(req_id, -32601, f"Unknown tool: {name}")
+    try:
+        return _rpc_result(req_id, tool(_arguments(params)))
+    except Exception:
+        return _rpc_error(req_id, -32602, "Invalid params")
+
+
+def _prompts_list(req_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _rpc_result(req_id, _PROMPTS_LIST_RESULT)
+
+
+def _prompts_get(req_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    name = str(params.get("name") or "")
+    if name != "example.greeting":
+        return _rpc_error(req_id, -32601, f"Unknown prompt: {name}")
+    who = str(_arguments(params).get("name") or "there")
+    return _rpc_result(
+        req_id,
+        {
+            "name": name,
+            "messages": [{"role": "system", "content": f"Say hello to {who}."}],
+        },
+    )
+
+
+# JSON-RPC method -> handler(req_id, params); initialize is handled in create_app (it sets the session header).
+_METHODS: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]] = {
+    "tools/list": _tools_list,
+    "tools/call": _tools_call,
+    "prompts/list": _prompts_list,
+    "prompts/get": _prompts_get,
+}
+
+
 def create_app() -> FastAPI:
     app = FastAPI(title="Agent Blob MCP Example Server", version="0.1.0")
     session_id = f"sid_{uuid.uuid4().hex[:12]}"
+    init_result = {
+        "protocolVersion": "2024-11-05",
+        "serverInfo": {"name": "agent_blob_mcp_example", "version": "0.1.0"},
+        "capabilities": {"tools": {}, "prompts": {}},
+        "sessionId": session_id,
+    }
 
     @app.get("/health")
     async def health():
@@ -47,12 +182,12 @@ def create_app() -> FastAPI:
     @app.post("/mcp")
     async def mcp(request: Request):
         try:
-            payload = await request.json()
+            payload = _loads(await request.body())
         except Exception:
-            return JSONResponse(_rpc_error("unknown", -32700, "Parse error"), status_code=200)
+            return _response(_rpc_error("unknown", -32700, "Parse error"))
 
         if not isinstance(payload, dict):
-            return JSONResponse(_rpc_error("unknown", -32600, "Invalid Request"), status_code=200)
+            return _response(_rpc_error("unknown", -32600, "Invalid Request"))
 
         req_id = str(payload.get("id") or "unknown")
         method = str(payload.get("method") or "")
@@ -61,107 +196,12 @@ def create_app() -> FastAPI:
             params = {}
 
         if method == "initialize":
-            res = _rpc_result(
-                req_id,
-                {
-                    "protocolVersion": "2024-11-05",
-                    "serverInfo": {"name": "agent_blob_mcp_example", "version": "0.1.0"},
-                    "capabilities": {"tools": {}, "prompts": {}},
-                    "sessionId": session_id,
-                },
-            )
-            return JSONResponse(res, headers={"Mcp-Session-Id": session_id})
-
-        if method == "tools/list":
-            return JSONResponse(
-                _rpc_result(
-                    req_id,
-                    {
-                        "tools": [
-                            {
-                                "name": "example.echo",
-                                "description": "Echo back the provided text.",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {"text": {"type": "string"}},
-                                    "required": ["text"],
-                                },
-                            },
-                            {
-                                "name": "example.add",
-                                "description": "Add two numbers.",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
-                                    "required": ["a", "b"],
-                                },
-                            },
-                            {
-                                "name": "example.time",
-                                "description": "Return server time (unix seconds).",
-                                "inputSchema": {"type": "object", "properties": {}},
-                            },
-                        ]
-                    },
-                )
-            )
-
-        if method == "tools/call":
-            name = str(params.get("name") or "")
-            arguments = params.get("arguments") or {}
-            if not isinstance(arguments, dict):
-                arguments = {}
-
-            if name == "example.echo":
-                text = str(arguments.get("text") or "")
-                return JSONResponse(_rpc_result(req_id, {"content": [{"type": "text", "text": text}]}))
-            if name == "example.add":
-                try:
-                    a = float(arguments.get("a"))
-                    b = float(arguments.get("b"))
-                except Exception:
-                    return JSONResponse(_rpc_error(req_id, -32602, "Invalid params"), status_code=200)
-                return JSONResponse(_rpc_result(req_id, {"content": [{"type": "text", "text": str(a + b)}]}))
-            if name == "example.time":
-                return JSONResponse(_rpc_result(req_id, {"content": [{"type": "text", "text": str(int(time.time()))}]}))
-
-            return JSONResponse(_rpc_error(req_id, -32601, f"Unknown tool: {name}"), status_code=200)
-
-        if method == "prompts/list":
-            return JSONResponse(
-                _rpc_result(
-                    req_id,
-                    {
-                        "prompts": [
-                            {
-                                "name": "example.greeting",
-                                "description": "A simple greeting prompt template.",
-                                "arguments": [{"name": "name", "description": "Name to greet", "required": False}],
-                            }
-                        ]
-                    },
-                )
-            )
-
-        if method == "prompts/get":
-            name = str(params.get("name") or "")
-            arguments = params.get("arguments") or {}
-            if not isinstance(arguments, dict):
-                arguments = {}
-            if name != "example.greeting":
-                return JSONResponse(_rpc_error(req_id, -32601, f"Unknown prompt: {name}"), status_code=200)
-            who = str(arguments.get("name") or "there")
-            return JSONResponse(
-                _rpc_result(
-                    req_id,
-                    {
-                        "name": name,
-                        "messages": [{"role": "system", "content": f"Say hello to {who}."}],
-                    },
-                )
-            )
-
-        return JSONResponse(_rpc_error(req_id, -32601, f"Unknown method: {method}"), status_code=200)
+            return _response(_rpc_result(req_id, init_result), headers={"Mcp-Session-Id": session_id})
+
+        handler = _METHODS.get(method)
+        if handler is None:
+            return _response(_rpc_error(req_id, -32601, f"Unknown method: {method}"))
+        return _response(handler(req_id, params))
 
     return app
 